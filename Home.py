@@ -1,7 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import random
 
 from utils.pdf_export import add_pdf_export, load_css
 
@@ -44,51 +41,45 @@ elif st.session_state["project_choice"] == "dominant":
     # --- Back to Home button ---
     if st.button("🏠 Back to Home", key="back_home", use_container_width=True):
         st.session_state["project_choice"] = None
-        st.experimental_rerun()
-
-    @st.cache_data
-    def generate_demo_data():
-        names = ["Shreyas", "Arnab", "Aditya", "Arjun", "Krishna", "Rohan", "Ishaan", "Kunal", "Sanya", "Ananya", "Priya", "Kavya", "Ritika", "Nisha", "Meera", "Divya", "Rahul", "Amit", "Sneha", "Pooja",
-                 "Rahul", "Tanvi", "Kabir", "Riya", "Anvi", "Aarav", "Aanya", "Vihaan", "Sara", "Om", "Neha", "Nitin", "Akash"]
-        data = [[i, name, random.randint(18, 25), random.choice(["Brown", "Black"]), random.choice(["Yes", "No"]),
-                 random.choice(["Free", "Attached"]), random.choice(["Yes", "No"]),
-                 random.choices(["Right", "Left", "Mixed"], weights=[0.89, 0.10, 0.01])[0]]
-                for i, name in enumerate(names, 1)]
-        fields = ["S.No", "Name", "Age", "Eye Colour", "Dimples", "Earlobe", "Tongue Roll", "Handedness"]
-        return pd.DataFrame(data, columns=fields)
-
-    REQUIRED_COLS = {"Name", "Age", "Eye Colour", "Dimples", "Earlobe", "Tongue Roll", "Handedness"}
-
-    uploaded_file = st.sidebar.file_uploader("📂 Upload your own CSV data", type="csv")
-    if uploaded_file is not None:
-        df = pd.read_csv(uploaded_file)
-        if not REQUIRED_COLS.issubset(df.columns):
-            st.error(f"Error: The uploaded CSV must contain these columns: {', '.join(REQUIRED_COLS)}")
-            st.stop()
-        if 'S.No' not in df.columns:
-            df.insert(0, 'S.No', range(1, 1 + len(df)))
-    else:
-        df = generate_demo_data()
+        st.rerun()
+
+    # Imported here so the welcome screen does not load pandas, NumPy or Plotly
+    import pandas as pd
+    import plotly.express as px
+    from utils.association import association_matrix
+    from utils.charts import binned_counts, histogram_figure, payload_report, plotly_chart
+    from utils.trait_data import (MAX_NAME_OPTIONS, explorer_rows, find_names, get_dataset_hash, get_trait_cube,
+                                  get_trait_dataset, get_trait_index, memory_sidebar, style_highlight, trait_data_sidebar,
+                                  value_mask)
+
+    @st.cache_data(max_entries=16, show_spinner="Computing associations...")
+    def cached_associations(dataset_hash, _df, columns, sample_size):
+        # Keyed on the dataset hash; the frame itself is not hashed
+        return association_matrix(_df, list(columns), sample_size)
+
+    df = trait_data_sidebar()
+    index = get_trait_index(get_trait_dataset())
 
     with st.sidebar:
         st.header("🔬 Filter & Display Controls")
         trait_options = ["Eye Colour", "Dimples", "Earlobe", "Tongue Roll", "Handedness"]
         selected_trait = st.selectbox("Highlight trait:", trait_options)
-        unique_values = df[selected_trait].unique()
+        unique_values = index.values(selected_trait)
         selected_value = st.radio(f"Highlight value for {selected_trait}:", unique_values, horizontal=True)
         st.markdown("---")
         st.header("📤 Export Options")
-        csv = df.to_csv(index=False).encode('utf-8')
-        st.download_button("Download Data as CSV", csv, "genetic_traits_data.csv", "text/csv")
+        # Serialised only when clicked; writing a large dataset to CSV takes seconds
+        st.download_button("Download Data as CSV", lambda: df.to_csv(index=False).encode('utf-8'), "genetic_traits_data.csv", "text/csv")
         add_pdf_export()
+    memory_sidebar()
 
     st.title("🧬 Genetic Traits Dashboard")
     st.markdown("An interactive dashboard to explore, visualize, and predict genetic traits.")
 
     st.markdown("### 📊 Quick Stats")
-    total_individuals = len(df)
-    right_handed_percentage = (df['Handedness'].value_counts(normalize=True).get('Right', 0)) * 100
-    dimples_percentage = (df['Dimples'].value_counts(normalize=True).get('Yes', 0)) * 100
+    total_individuals = index.n_rows
+    right_handed_percentage = index.fraction('Handedness', 'Right') * 100
+    dimples_percentage = index.fraction('Dimples', 'Yes') * 100
     col1, col2, col3 = st.columns(3)
     with col1: st.metric("Total Individuals", f"{total_individuals}")
     with col2: st.metric("Right-Handed", f"{right_handed_percentage:.1f}%")
@@ -96,9 +87,17 @@ elif st.session_state["project_choice"] == "dominant":
 
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("### 👤 Personal Trait Profile")
-    person_name = st.selectbox("Select an individual to view their profile:", df['Name'].unique())
+    # Only a bounded number of names is sent to the browser; large datasets are searched by name
+    name_query = st.text_input("Search by name:", key="profile_name_query") if index.n_rows > MAX_NAME_OPTIONS else ""
+    name_cache = st.session_state.get("profile_names")
+    if name_cache is None or name_cache["df"] is not df or name_cache["query"] != name_query:
+        name_cache = st.session_state["profile_names"] = {"df": df, "query": name_query, "names": find_names(df, name_query)}
+    names = name_cache["names"]
+    if len(names) >= MAX_NAME_OPTIONS:
+        st.caption(f"Showing the first {MAX_NAME_OPTIONS:,} matching names; type more of a name to narrow the list.")
+    person_name = st.selectbox("Select an individual to view their profile:", list(names))
     if person_name:
-        person_data = df[df['Name'] == person_name].iloc[0]
+        person_data = df.iloc[names[person_name]]
         st.markdown(f"""
         <div class="profile-card">
             <div class="profile-name">{person_data['Name']}</div>
@@ -114,39 +113,125 @@ elif st.session_state["project_choice"] == "dominant":
         """, unsafe_allow_html=True)
 
     st.markdown("---")
-    tab1, tab2, tab3 = st.tabs(["🗃️ Dataset Explorer", "📈 Trait Analysis", "🔥 Correlation Analysis"])
+    tab1, tab2, tab3, tab4 = st.tabs(["🗃️ Dataset Explorer", "📈 Trait Analysis", "🔥 Correlation Analysis", "🧊 Cross-tab Explorer"])
 
     with tab1:
         st.header("Full Dataset")
-        def highlight_rows(row):
-            if row[selected_trait] == selected_value:
-                return ['background-color: #2575FC; color: white'] * len(row)
-            return [''] * len(row)
-        st.dataframe(df.style.apply(highlight_rows, axis=1), use_container_width=True, height=500)
+        sort_cache = st.session_state.get("explorer_sort_cache")
+        if sort_cache is None or sort_cache["df"] is not df:
+            sort_cache = st.session_state["explorer_sort_cache"] = {"df": df, "orders": {}}
+
+        filters = {}
+        with st.expander("🔎 Filter & Sort"):
+            fcol1, fcol2 = st.columns(2)
+            with fcol1:
+                name_query = st.text_input("Name contains:", key="explorer_name")
+                if name_query:
+                    filters["Name"] = name_query
+                age_min, age_max, _ = index.age_stats()
+                if age_min < age_max:
+                    age_range = st.slider("Age range:", age_min, age_max, (age_min, age_max), key="explorer_age")
+                    if age_range != (age_min, age_max):
+                        filters["Age"] = age_range
+                highlighted_only = st.checkbox(f"Only rows where {selected_trait} is {selected_value}", key="explorer_highlighted")
+            with fcol2:
+                for trait in trait_options:
+                    values = st.multiselect(f"{trait}:", index.values(trait), key=f"explorer_{trait}")
+                    if values:
+                        filters[trait] = values
+            if highlighted_only:
+                filters[selected_trait] = [v for v in filters.get(selected_trait, [selected_value]) if v == selected_value]
+            scol1, scol2, scol3 = st.columns(3)
+            sort_by = scol1.selectbox("Sort by:", ["(file order)"] + list(df.columns), key="explorer_sort")
+            ascending = scol2.radio("Order:", ["Ascending", "Descending"], horizontal=True, key="explorer_order") == "Ascending"
+            page_size = scol3.selectbox("Rows per page:", [50, 100, 500, 1000], index=1, key="explorer_page_size")
+
+        rows = explorer_rows(df, filters, None if sort_by == "(file order)" else sort_by, ascending, sort_cache["orders"], index)
+        n_pages = max(1, -(-rows.size // page_size))
+        if st.session_state.get("explorer_page", 1) > n_pages:
+            st.session_state["explorer_page"] = n_pages
+        pcol1, pcol2 = st.columns([1, 3])
+        page = pcol1.number_input("Page", 1, n_pages, key="explorer_page")
+        start = (page - 1) * page_size
+        pcol2.caption(f"Rows {min(start + 1, rows.size):,}–{min(start + page_size, rows.size):,} of {rows.size:,} matching ({len(df):,} total)")
+        # Only the visible slice is built and styled
+        page_df = df.iloc[rows[start:start + page_size]]
+        page_highlight = value_mask(page_df, selected_trait, selected_value)
+        st.dataframe(style_highlight(page_df, page_highlight), use_container_width=True, height=500, hide_index=True)
     with tab2:
         st.header("Detailed Summary for Each Trait")
         with st.expander("🎂 Analysis for: Age"):
-            fig_hist = px.histogram(df, x="Age", nbins=8, title="Age Distribution of Individuals")
-            st.plotly_chart(fig_hist, use_container_width=True)
+            age_hist = index.age_histogram()
+            fig_hist = histogram_figure(binned_counts(age_hist["Age"], age_hist["Count"], 8), "Age", "Age Distribution of Individuals")
+            plotly_chart(fig_hist, "Age histogram", use_container_width=True)
         for trait in trait_options:
             with st.expander(f"🔬 Analysis for: **{trait}**"):
-                counts = df[trait].value_counts()
+                counts = index.value_counts(trait)
                 summary_df = pd.DataFrame({"Value": counts.index, "Count": counts.values}).reset_index(drop=True)
                 col1, col2 = st.columns(2)
                 with col1:
                     fig_bar = px.bar(summary_df, x="Value", y="Count", color="Value", title=f"Bar Chart: {trait}")
-                    st.plotly_chart(fig_bar, use_container_width=True)
+                    plotly_chart(fig_bar, f"{trait} bar", use_container_width=True)
                 with col2:
                     fig_pie = px.pie(summary_df, names="Value", values="Count", title=f"Pie Chart: {trait}", hole=0.3)
-                    st.plotly_chart(fig_pie, use_container_width=True)
+                    plotly_chart(fig_pie, f"{trait} pie", use_container_width=True)
     with tab3:
-        st.header("Correlation Heatmap")
-        df_corr = df.drop(columns=['S.No', 'Name']).copy()
-        for col in df_corr.columns:
-            if df_corr[col].dtype == 'object':
-                df_corr[col] = df_corr[col].astype('category').cat.codes
-        corr = df_corr.corr()
-        fig_heatmap = px.imshow(corr, text_auto=True, aspect="auto", color_continuous_scale='RdBu_r', title="Feature Correlation Heatmap")
-        st.plotly_chart(fig_heatmap, use_container_width=True)
+        st.header("Association Heatmap")
+        st.caption("Cramér's V between traits, the correlation ratio between a trait and Age, and Pearson's r "
+                   "between numeric columns. All range from 0 (none) to 1 (perfect); Pearson can also be negative.")
+        assoc_cols = [col for col in df.columns if col not in ('S.No', 'Name')]
+        sampled = st.toggle("Sampled mode (faster on large data, with 95% error bounds)", value=len(df) > 500_000, key="assoc_sampled")
+        sample_size = None
+        if sampled:
+            sample_size = st.number_input("Rows to sample:", 1_000, 1_000_000, 100_000, step=10_000, key="assoc_sample_size")
+        assoc = cached_associations(get_dataset_hash(get_trait_dataset()), df, tuple(assoc_cols), sample_size)
+        text = assoc["matrix"].round(2).astype(str)
+        if assoc["error"] is not None:
+            text = text + " ± " + assoc["error"].round(3).astype(str)
+        fig_heatmap = px.imshow(assoc["matrix"], aspect="auto", color_continuous_scale='RdBu_r', zmin=-1, zmax=1, title="Feature Association Heatmap")
+        fig_heatmap.update_traces(text=text.to_numpy(), texttemplate="%{text}", customdata=assoc["methods"].to_numpy(),
+                                  hovertemplate="%{y} / %{x}<br>%{customdata}: %{text}<extra></extra>")
+        plotly_chart(fig_heatmap, "Association heatmap", use_container_width=True)
+        if assoc["error"] is not None:
+            st.caption(f"Estimated from {assoc['rows']:,} of {len(df):,} rows.")
+
+    with tab4:
+        st.header("Cross-tab Explorer")
+        st.markdown("Group, slice and roll up the traits. Answers come from a count cube built once per dataset, "
+                    "so they do not rescan the rows.")
+        cube = get_trait_cube(get_trait_dataset())
+        dims = cube.dims
+        xcol1, xcol2 = st.columns(2)
+        with xcol1:
+            ct_rows = st.multiselect("Group rows by:", dims, default=["Eye Colour"], key="cube_rows")
+            column_options = ["(none)"] + [d for d in dims if d not in ct_rows]
+            ct_columns = st.selectbox("Columns:", column_options, index=column_options.index("Earlobe") if "Earlobe" in column_options else 0,
+                                      key="cube_columns")
+            ct_columns = None if ct_columns == "(none)" else ct_columns
+            normalize_label = st.radio("Show:", ["Counts", "% of row", "% of column", "% of total"], horizontal=True, key="cube_normalize")
+            age_band = st.select_slider("Age band width:", [1, 5, 10, 20], value=5, key="cube_age_band")
+        with xcol2:
+            ct_filters = {}
+            for dim in trait_options:
+                chosen = st.multiselect(f"Only {dim}:", cube.labels[dim], key=f"cube_filter_{dim}")
+                if chosen:
+                    ct_filters[dim] = chosen
+        normalize = {"Counts": None, "% of row": "index", "% of column": "columns", "% of total": "all"}[normalize_label]
+        crosstab = cube.crosstab(ct_rows, ct_columns, filters=ct_filters, bands={"Age": age_band} if age_band > 1 else None, normalize=normalize)
+        if normalize:
+            st.dataframe(crosstab.style.format("{:.1%}"), use_container_width=True)
+        else:
+            st.dataframe(crosstab, use_container_width=True)
+        if ct_rows and ct_columns:
+            heat = crosstab.copy()
+            heat.index = [" / ".join(map(str, i)) if isinstance(i, tuple) else str(i) for i in heat.index]
+            fig_cube = px.imshow(heat, text_auto=".1%" if normalize else True, aspect="auto", color_continuous_scale="Blues",
+                                 labels={"x": ct_columns, "y": " / ".join(ct_rows)})
+            plotly_chart(fig_cube, "Cross-tab heatmap", use_container_width=True)
+
+    with st.expander("📦 Chart payloads"):
+        payloads = payload_report()
+        st.dataframe(payloads, hide_index=True)
+        st.caption(f"Total figure JSON sent to the browser: {payloads['bytes'].sum():,} bytes")
 
     st.markdown("<div style='text-align:center; color:grey; padding-top: 2rem;'>👨‍💻 Created by Shreyas Sahoo</div>", unsafe_allow_html=True)
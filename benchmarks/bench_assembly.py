@@ -0,0 +1,52 @@
+"""De Bruijn assembly throughput and memory as the reference grows.
+
+Run from the repository root: python -m benchmarks.bench_assembly [--lengths 10000 100000 ...]
+"""
+import argparse
+import time
+import tracemalloc
+from utils.assembly import check_assembly, contig_n50, debruijn_assemble, random_reference, simulate_read_batches
+
+
+def run(length, coverage, read_length, error_rate, k, min_count, seed):
+    reference = random_reference(length, seed)
+    tracemalloc.start()
+    start = time.perf_counter()
+    contigs, counter = debruijn_assemble(simulate_read_batches(reference, coverage, read_length, error_rate, seed), k, min_count)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    report = check_assembly(contigs, reference)
+    read_bases = coverage * length
+    return {
+        "reference": length,
+        "seconds": elapsed,
+        "read Mbases/s": read_bases / elapsed / 1e6,
+        "distinct k-mers": counter.size,
+        "table MB": counter.nbytes / 1e6,
+        "peak MB": peak / 1e6,
+        "contigs": report["contigs"],
+        "N50": contig_n50(contigs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--coverage", type=float, default=20)
+    parser.add_argument("--read-length", type=int, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.001)
+    parser.add_argument("-k", type=int, default=31)
+    parser.add_argument("--min-count", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = [run(n, args.coverage, args.read_length, args.error_rate, args.k, args.min_count, args.seed) for n in args.lengths]
+    header = list(rows[0])
+    print(" | ".join(f"{h:>15}" for h in header))
+    for row in rows:
+        print(" | ".join(f"{v:>15,.2f}" if isinstance(v, float) else f"{v:>15,}" for v in row.values()))
+
+
+if __name__ == "__main__":
+    main()
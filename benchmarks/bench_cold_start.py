@@ -0,0 +1,90 @@
+"""Cold-start time of every page: the first render in a fresh Python process, with import cost by package.
+
+Run from the repository root: python -m benchmarks.bench_cold_start [--repeat 3] [--top 8]
+Each run starts a new interpreter with -X importtime and empty dataset/model caches, renders one
+page with Streamlit's AppTest and counts only the modules imported while the page ran (Streamlit
+and AppTest themselves are loaded first and left out).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = {
+    "Home (welcome)": ("Home.py", None),
+    "Home (dominant)": ("Home.py", "dominant"),
+    "Journal": ("pages/1_📖_Journal.py", None),
+    "Trait Prediction": ("pages/2_🤖_Trait_Prediction.py", None),
+    "Genome Explorer": ("pages/3_🌐_Human_Genome_Explorer.py", None),
+}
+
+
+def worker(path, choice):
+    # Runs inside the fresh interpreter: prints the render time and the modules loaded beforehand
+    import time
+    from streamlit.testing.v1 import AppTest
+    preloaded = sorted(sys.modules)
+    at = AppTest.from_file(os.path.join(ROOT, path), default_timeout=300)
+    if choice:
+        at.session_state["project_choice"] = choice
+    start = time.perf_counter()
+    at.run()
+    print(json.dumps({"render": time.perf_counter() - start, "preloaded": preloaded,
+                      "errors": [e.message for e in at.exception]}))
+
+
+def parse_importtime(stderr, preloaded):
+    # Self time in seconds per top-level package, for modules not already loaded before the run
+    by_package = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if name not in preloaded:
+            by_package[name.split(".")[0]] += int(self_us) / 1e6
+    return by_package
+
+
+def run(path, choice):
+    with tempfile.TemporaryDirectory() as cache:
+        env = {**os.environ, "DATASET_CACHE_DIR": os.path.join(cache, "datasets"),
+               "MODEL_CACHE_DIR": os.path.join(cache, "models")}
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "benchmarks.bench_cold_start",
+                               "--worker", path] + (["--choice", choice] if choice else []),
+                              capture_output=True, text=True, env=env, cwd=ROOT, check=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    if result["errors"]:
+        raise RuntimeError(f"{path}: {result['errors']}")
+    return result["render"], parse_importtime(proc.stderr, set(result["preloaded"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--choice", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        return worker(args.worker, args.choice)
+
+    for name in args.pages:
+        path, choice = PAGES[name]
+        runs = [run(path, choice) for _ in range(args.repeat)]
+        render = statistics.median(r for r, _ in runs)
+        imports = {package: statistics.median(r[package] for _, r in runs) for package in runs[0][1]}
+        print(f"{name}: first render {render * 1000:,.0f} ms, imports {sum(imports.values()) * 1000:,.0f} ms "
+              f"(median of {args.repeat})")
+        for package, seconds in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {package:<24} {seconds * 1000:>8,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Write a reproducible synthetic trait dataset for load-testing the dashboard and the model page.
+
+Run from the repository root: python -m benchmarks.generate_traits --rows 10000000 --out traits.csv
+--out must end in .csv or .parquet; the file is written in that format one chunk at a time.
+Correlations are given as "Column A:Column B:rho", e.g. --correlate "Dimples:Tongue Roll:0.5".
+"""
+import argparse
+import os
+import time
+from utils.synthetic import write_traits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--out", default="traits.csv")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--min-age", type=int, default=18)
+    parser.add_argument("--max-age", type=int, default=25)
+    parser.add_argument("--correlate", action="append", default=[], metavar="A:B:RHO")
+    args = parser.parse_args()
+    if os.path.splitext(args.out)[1].lower() not in (".csv", ".parquet"):
+        parser.error("--out must end in .csv or .parquet")
+
+    correlations = {}
+    for spec in args.correlate:
+        a, b, rho = spec.rsplit(":", 2)
+        correlations[(a, b)] = float(rho)
+    start = time.perf_counter()
+    write_traits(args.out, args.rows, seed=args.seed, correlations=correlations,
+                 age_range=(args.min_age, args.max_age), chunk_rows=args.chunk_rows)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(args.out)
+    print(f"{args.rows:,} rows -> {args.out} ({size / 1e6:,.1f} MB) in {elapsed:.1f} s ({args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
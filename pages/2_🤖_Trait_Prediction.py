@@ -1,57 +1,96 @@
-import streamlit as st
+import os
+import tempfile
 import pandas as pd
-import random
-from sklearn.model_selection import train_test_split
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import accuracy_score
-import graphviz
-from sklearn.tree import export_graphviz
+import streamlit as st
 from utils.pdf_export import add_pdf_export, load_css
+from utils.charts import line_figure, plotly_chart
+from utils.dataset_cache import content_hash, release_temp_file, session_temp_file, spool_upload
+from utils.models import (DEFAULT_PARAMS, MIN_TRAINING_ROWS, STREAM_PARAMS, TUNE_GRID, get_model_registry, predict,
+                          score_csv, train_streaming_model, tune_trait_model)
+from utils.trait_data import get_dataset_hash, get_trait_dataset, get_trait_index, memory_sidebar, trait_data_sidebar
+from utils.tree_view import (MAX_LEVELS, MAX_RENDER_NODES, feature_importance_table, leaf_path_table, node_path, parents,
+                             render_tree)
 
 st.set_page_config(page_title="Trait Prediction", page_icon="🤖", layout="wide")
 load_css()
 
-@st.cache_data
-def generate_demo_data():
-    names = ["Shreyas", "Arnab", "Aditya", "Arjun", "Krishna", "Rohan", "Ishaan", "Kunal", "Sanya", "Ananya", "Priya", "Kavya", "Ritika", "Nisha", "Meera", "Divya", "Rahul", "Amit", "Sneha", "Pooja", "Varun", "Neha", "Shreya", "Manish", "Akash", "Vikram", "Sunita", "Lakshmi", "Ramesh", "Deepak", "Geeta", "Ajay", "Suresh", "Anjali", "Swati"]
-    data = [[i, name, random.randint(18, 25), random.choice(["Brown", "Black"]), random.choice(["Yes", "No"]), random.choice(["Free", "Attached"]), random.choice(["Yes", "No"]), random.choices(["Right", "Left", "Mixed"], weights=[0.89, 0.10, 0.01])[0]] for i, name in enumerate(names, 1)]
-    fields = ["S.No", "Name", "Age", "Eye Colour", "Dimples", "Earlobe", "Tongue Roll", "Handedness"]
-    return pd.DataFrame(data, columns=fields)
-
-REQUIRED_COLS = {"Name", "Age", "Eye Colour", "Dimples", "Earlobe", "Tongue Roll", "Handedness"}
-
-uploaded_file = st.sidebar.file_uploader("📂 Upload your own CSV data", type="csv")
-if uploaded_file is not None:
-    st.sidebar.success("Custom data loaded!")
-    df = pd.read_csv(uploaded_file)
-    if not REQUIRED_COLS.issubset(df.columns):
-        st.error(f"Error: The uploaded CSV must contain these columns: {', '.join(REQUIRED_COLS)}")
-        st.stop()
-else:
-    st.sidebar.info("Using demo data. Upload a CSV to analyze your own!")
-    df = generate_demo_data()
+df = trait_data_sidebar()
+memory_sidebar()
 
 st.title("🤖 Trait Prediction using a Machine Learning Model")
 st.markdown("This model trains on the currently loaded data to predict handedness.")
-df_ml = df.drop(columns=['S.No', 'Name'])
-encoders = {}
-for column in df_ml.select_dtypes(include=['object']).columns:
-    le = LabelEncoder()
-    df_ml[column] = le.fit_transform(df_ml[column])
-    encoders[column] = le
-
-X = df_ml.drop('Handedness', axis=1)
-y = df_ml['Handedness']
-feature_names = X.columns.tolist()
-if len(df) > 10:
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
-    model = DecisionTreeClassifier(max_depth=4, random_state=42)
-    model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
-    accuracy = accuracy_score(y_test, y_pred)
+
+with st.sidebar.expander("⚙️ Model settings"):
+    mode = st.radio("Training:", ["Decision tree", "Cross-validated search", "Streaming (out-of-core)"], key="model_mode",
+                    help="Streaming trains a naive Bayes model chunk by chunk, so memory stays bounded on very large data.")
+    stream_file = None
+    if mode == "Streaming (out-of-core)":
+        if st.toggle("Stream from a CSV file", key="stream_from_file",
+                     help="The file is copied to disk and read back in chunks; it is never loaded as one table."):
+            stream_file = st.file_uploader("Training CSV", type="csv", key="stream_upload")
+        holdout = st.slider("Holdout share:", 0.05, 0.3, STREAM_PARAMS["holdout"], 0.05, key="stream_holdout")
+        chunk_rows = st.select_slider("Rows per chunk:", [50_000, 100_000, 250_000, 1_000_000], STREAM_PARAMS["chunk_rows"],
+                                      format_func=lambda n: f"{n:,}", key="stream_chunk_rows")
+        params = {**STREAM_PARAMS, "holdout": holdout, "chunk_rows": chunk_rows, "mode": "streaming"}
+    elif mode == "Cross-validated search":
+        # The search only runs when the form is submitted
+        with st.form("model_search_form"):
+            depths = st.multiselect("Tree depths:", TUNE_GRID["max_depth"], TUNE_GRID["max_depth"])
+            leaves = st.multiselect("Min samples per leaf:", TUNE_GRID["min_samples_leaf"], TUNE_GRID["min_samples_leaf"])
+            weights = st.multiselect("Class weights:", ["none", "balanced"], ["none", "balanced"])
+            n_splits = st.slider("Folds:", 3, 10, 5)
+            scoring = st.selectbox("Pick the best model by:", ["balanced_accuracy", "accuracy"],
+                                   format_func=lambda s: s.replace("_", " "))
+            if st.form_submit_button("Run search") and depths and leaves and weights:
+                st.session_state["model_search"] = {
+                    "max_depth": sorted(depths), "min_samples_leaf": sorted(leaves),
+                    "class_weight": [None if w == "none" else w for w in weights],
+                    "n_splits": n_splits, "scoring": scoring, "random_state": DEFAULT_PARAMS["random_state"]}
+        if "model_search" not in st.session_state:
+            st.caption("Using the default model until a search has run.")
+        params = dict(DEFAULT_PARAMS)
+    else:
+        max_depth = st.slider("Max tree depth:", 1, 12, DEFAULT_PARAMS["max_depth"], key="model_max_depth")
+        min_samples_leaf = st.slider("Min samples per leaf:", 1, 200, DEFAULT_PARAMS["min_samples_leaf"], key="model_min_samples_leaf")
+        params = {**DEFAULT_PARAMS, "max_depth": max_depth, "min_samples_leaf": min_samples_leaf}
+search = st.session_state.get("model_search") if mode == "Cross-validated search" else None
+
+# The model trains on the loaded dataset, or in streaming mode on a CSV spooled to disk
+training_hash, training_source = get_dataset_hash(get_trait_dataset()), df
+if stream_file is not None:
+    spooled = st.session_state.get("stream_spool")
+    # The copy is deleted when the session ends; it is made again if the session comes back
+    if spooled is None or spooled["file_id"] != stream_file.file_id or not os.path.exists(spooled["path"]):
+        if spooled is not None:
+            release_temp_file(spooled["path"])
+        spooled = {"file_id": stream_file.file_id, "path": session_temp_file(spool_upload(stream_file, prefix="stream_train_")),
+                   "hash": content_hash(stream_file)}
+        st.session_state["stream_spool"] = spooled
+    training_hash, training_source = spooled["hash"], spooled["path"]
+
+# Trained (or tuned) once per dataset and settings; widget changes below only look the model up
+registry = get_model_registry()
+model = None
+if stream_file is not None or len(df) >= MIN_TRAINING_ROWS:
+    try:
+        if mode == "Streaming (out-of-core)":
+            with st.spinner("Training chunk by chunk..."):
+                bundle, model_source = registry.get(training_hash, training_source, params, train=train_streaming_model)
+        elif search is None:
+            bundle, model_source = registry.get(training_hash, training_source, params)
+        else:
+            with st.spinner("Cross-validating the parameter grid..."):
+                bundle, model_source = registry.get(training_hash, training_source, search, train=tune_trait_model)
+    except ValueError as e:
+        st.error(str(e))
+        accuracy = "N/A (Training failed)"
+    else:
+        model, encoders, feature_names, accuracy = bundle["model"], bundle["encoders"], bundle["feature_names"], bundle["accuracy"]
+        model_key = registry.key(training_hash, search or params)
+        st.sidebar.caption(f"Model {model_source} · trained on {bundle['rows']:,} rows"
+                           f"{' streamed from ' + stream_file.name if stream_file is not None else ''} "
+                           f"in {bundle['train_seconds']:.2f} s · {len(registry)} cached ({registry.nbytes / 1024:,.0f} KB)")
 else:
-    model = None
     accuracy = "N/A (Dataset too small)"
 
 st.markdown("---")
@@ -66,26 +105,119 @@ if model is not None:
         earlobe = st.selectbox("Earlobe:", encoders['Earlobe'].classes_)
         tongue_roll = st.selectbox("Tongue Roll:", encoders['Tongue Roll'].classes_)
     with col3:
-        age = st.slider("Age:", int(df['Age'].min()), int(df['Age'].max()), int(df['Age'].mean()))
+        age_min, age_max, age_mean = get_trait_index(get_trait_dataset()).age_stats()
+        age = st.slider("Age:", age_min, age_max, int(age_mean))
 
     if st.button("Predict Handedness", type="primary"):
-        input_data = pd.DataFrame({'Age': [age], 'Eye Colour': [encoders['Eye Colour'].transform([eye_colour])[0]], 'Dimples': [encoders['Dimples'].transform([dimples])[0]], 'Earlobe': [encoders['Earlobe'].transform([earlobe])[0]], 'Tongue Roll': [encoders['Tongue Roll'].transform([tongue_roll])[0]]})
-        prediction_encoded = model.predict(input_data)[0]
-        prediction_decoded = encoders['Handedness'].inverse_transform([prediction_encoded])[0]
-        st.success(f"**Predicted Handedness:** {prediction_decoded}")
+        try:
+            prediction_decoded = predict(bundle, {'Age': age, 'Eye Colour': eye_colour, 'Dimples': dimples, 'Earlobe': earlobe, 'Tongue Roll': tongue_roll})
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            st.success(f"**Predicted Handedness:** {prediction_decoded}")
+
+    st.subheader("📦 Batch Prediction")
+    st.markdown(f"Upload a CSV with the columns **{', '.join(feature_names)}** to score every row. "
+                "Rows with missing or unseen values get an empty prediction.")
+    batch_file = st.file_uploader("Upload individuals to score (CSV)", type="csv", key="batch_upload")
+    scored = st.session_state.get("batch_scored")
+    # A result is only offered for the file and model it was scored with (and while the file,
+    # which is deleted when the session ends, is still there)
+    if scored is not None and (batch_file is None or scored["file_id"] != batch_file.file_id or scored["model"] != model_key
+                               or not os.path.exists(scored["path"])):
+        scored = None
+    if batch_file is not None and scored is None and st.button("Score file"):
+        fd, out_path = tempfile.mkstemp(suffix=".csv", prefix="scored_")
+        os.close(fd)
+        session_temp_file(out_path)
+        progress = st.progress(0.0, text="Scoring...")
+        rows = 0
+        try:
+            for rows in score_csv(bundle, batch_file, out_path):
+                progress.progress(min(batch_file.tell() / max(batch_file.size, 1), 1.0), text=f"Scored {rows:,} rows")
+        except ValueError as e:
+            progress.empty()
+            release_temp_file(out_path)
+            st.error(str(e))
+        else:
+            progress.empty()
+            previous = st.session_state.get("batch_scored")
+            if previous is not None:
+                release_temp_file(previous["path"])
+            scored = {"file_id": batch_file.file_id, "model": model_key, "path": out_path, "rows": rows}
+            st.session_state["batch_scored"] = scored
+    if scored is not None:
+        st.success(f"Scored {scored['rows']:,} rows.")
+        st.dataframe(pd.read_csv(scored["path"], nrows=20), hide_index=True)
+
+        def read_scored():
+            # Read only when the download is requested, and the file closed straight after
+            with open(scored["path"], "rb") as f:
+                return f.read()
+
+        st.download_button("Download scored CSV", read_scored, "scored_handedness.csv", "text/csv")
 else:
-    st.warning("Cannot make predictions because the dataset is too small to train a model.")
+    st.warning("Cannot make predictions because no model could be trained on this data.")
 
 st.markdown("---")
 st.header("🧠 How the Model Works")
 if isinstance(accuracy, float):
-    st.info(f"The Decision Tree Classifier achieved an accuracy of **{accuracy:.2f}%** on the test portion of the loaded data.", icon="💡")
+    if "cv_summary" in bundle:
+        best = bundle["cv_summary"].iloc[0]
+        st.info(f"The best Decision Tree (max depth {best['max_depth']}, min samples per leaf {best['min_samples_leaf']}, "
+                f"{best['class_weight']} class weights) scored **{best['mean_score']:.2%} ± {best['std_score']:.2%}** "
+                f"{bundle['search']['scoring'].replace('_', ' ')} and **{accuracy:.2%}** accuracy over "
+                f"{bundle['search']['n_splits']} stratified folds.", icon="💡")
+        with st.expander("📋 Cross-validation results"):
+            st.caption(f"{len(bundle['cv_results']):,} fits in {bundle['train_seconds']:.1f} s, best first")
+            st.dataframe(bundle["cv_summary"].drop(columns="grid"), hide_index=True)
+            st.markdown("**Folds of the best model**")
+            folds = bundle["cv_results"]
+            st.dataframe(folds[folds["grid"] == best["grid"]].drop(columns="grid"), hide_index=True)
+    elif "stream" in bundle:
+        st.info(f"The naive Bayes model was trained on {bundle['rows']:,} rows in {len(bundle['stream'])} chunks and scored "
+                f"**{accuracy:.2%}** accuracy on {bundle['holdout_rows']:,} held-out rows.", icon="💡")
+        plotly_chart(line_figure(bundle["stream"].set_index("rows")[["holdout_accuracy"]], "Running holdout accuracy"),
+                     "Streaming holdout", use_container_width=True)
+    else:
+        st.info(f"The Decision Tree Classifier achieved an accuracy of **{accuracy:.2%}** on the test portion of the loaded data.", icon="💡")
 else:
     st.info(f"Accuracy: **{accuracy}**", icon="💡")
 
-if model is not None:
+if hasattr(model, "tree_"):
     st.subheader("Visualizing the Decision Tree")
-    dot_data = export_graphviz(model, out_file=None, feature_names=feature_names, class_names=encoders['Handedness'].classes_, filled=True, rounded=True, special_characters=True)
-    st.graphviz_chart(dot_data)
+    tree = model.tree_
+    class_names = [str(c) for c in encoders['Handedness'].classes_[model.classes_]]
+    # The view starts at the root of each new model; picking a cut-off node redraws from there
+    if st.session_state.get("tree_model") != model_key:
+        st.session_state["tree_model"] = model_key
+        st.session_state["tree_root"] = 0
+        st.session_state.pop("tree_levels", None)
+    root = st.session_state.get("tree_root", 0)
+    levels = st.slider("Levels shown:", 1, max(1, min(MAX_LEVELS, tree.max_depth)), min(3, max(1, tree.max_depth)),
+                       key="tree_levels", disabled=tree.max_depth <= 1)
+    view, text, frontier = render_tree(model_key, model, feature_names, encoders, class_names, root, levels)
+    parent = parents(tree)
+    ancestors = []
+    node = root
+    while parent[node] >= 0:
+        node = parent[node]
+        ancestors.insert(0, int(node))
+    options = ancestors + [root] + frontier
+    st.selectbox("Show subtree at:", options, key="tree_root",
+                 format_func=lambda n: f"node {n}: {node_path(tree, n, feature_names, encoders, parent)}",
+                 help="Dashed nodes are cut off; pick one to expand it, or an ancestor to go back up.")
+    if view == "svg":
+        st.html(text)
+    else:
+        st.graphviz_chart(text)
+
+    with st.expander("📊 Tree summary", expanded=tree.node_count > MAX_RENDER_NODES):
+        if tree.node_count > MAX_RENDER_NODES:
+            st.caption(f"The tree has {tree.node_count:,} nodes, too many to read as one diagram.")
+        col1, col2 = st.columns([1, 3])
+        col1.dataframe(feature_importance_table(model, feature_names), hide_index=True)
+        col2.dataframe(leaf_path_table(model, feature_names, encoders, class_names), hide_index=True,
+                       column_config={"share": st.column_config.NumberColumn(format="percent")})
 
 add_pdf_export()
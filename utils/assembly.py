@@ -0,0 +1,420 @@
+from collections import defaultdict
+import numpy as np
+from utils.dna import PackedSequence, decode_sequence, encode_sequence
+
+
+# --- Pairwise overlap ---
+def get_overlap(a, b):
+    # Longest proper suffix of a that is a prefix of b, via the KMP failure function of
+    # b[:m] + separator + a[-m:] (linear instead of trying every suffix length).
+    # Works on str or PackedSequence; only the two m-base windows are decoded
+    m = min(len(a), len(b)) - 1
+    if m <= 0:
+        return 0
+    s = str(b[:m]) + "\0" + str(a[-m:])
+    fail = [0] * len(s)
+    k = 0
+    for i in range(1, len(s)):
+        while k and s[i] != s[k]:
+            k = fail[k - 1]
+        if s[i] == s[k]:
+            k += 1
+        fail[i] = k
+    return fail[-1]
+
+
+def assemble_fragments(order):
+    if not order:
+        return ""
+    result = str(order[0])
+    for frag in order[1:]:
+        olap = get_overlap(result, frag)
+        result += str(frag[olap:])
+    return result
+
+
+# --- Overlap graph ---
+# Overlaps are found through an index of SEED_LEN-base read prefixes (or min_overlap, if longer).
+# Shorter seeds match almost every read pair and make the graph quadratic in the number of reads.
+SEED_LEN = 16
+DEFAULT_MIN_OVERLAP = 20
+
+
+def remove_contained(reads, seed_len):
+    # Drop duplicates and reads that are substrings of a longer read; candidates come from
+    # an index of every seed_len-mer position in the reads
+    unique = sorted(set(reads), key=len, reverse=True)
+    kmer_index = defaultdict(set)
+    kept = []
+    for read in unique:
+        # Reads shorter than the seed have no seed to look up and are checked against every kept read
+        candidates = kmer_index.get(read[:seed_len], ()) if len(read) >= seed_len else range(len(kept))
+        if any(read in kept[j] for j in candidates):
+            continue
+        idx = len(kept)
+        kept.append(read)
+        for i in range(len(read) - seed_len + 1):
+            kmer_index[read[i:i + seed_len]].add(idx)
+    return kept
+
+
+def build_overlap_graph(reads, min_overlap):
+    # Edges (overlap, i, j) where a suffix of reads[i] of at least min_overlap bases is a prefix
+    # of reads[j]; suffixes are looked up in a hash index of read prefixes
+    prefix_index = defaultdict(list)
+    for j, read in enumerate(reads):
+        if len(read) >= min_overlap:
+            prefix_index[read[:min_overlap]].append(j)
+    edges = []
+    for i, read in enumerate(reads):
+        seen = set()
+        # Longest overlaps first, so the first hit for each j is its maximal overlap
+        for start in range(1, len(read) - min_overlap + 1):
+            for j in prefix_index.get(read[start:start + min_overlap], ()):
+                if j != i and j not in seen and reads[j].startswith(read[start:]):
+                    seen.add(j)
+                    edges.append((len(read) - start, i, j))
+    return edges
+
+
+def greedy_assemble(reads, min_overlap=DEFAULT_MIN_OVERLAP, seed_len=SEED_LEN):
+    # Greedy shortest-superstring: merge along the heaviest overlaps first, each read taking at
+    # most one successor and one predecessor, then walk the resulting paths into contigs.
+    # Overlaps shorter than the seed are not searched for; pass seed_len=1 for tiny read sets.
+    seed_len = max(1, min_overlap, seed_len)
+    reads = remove_contained([str(r) for r in reads if len(r)], seed_len)
+    edges = build_overlap_graph(reads, seed_len)
+    edges.sort(reverse=True)
+    successor = {}
+    predecessor = {}
+    chain_head = list(range(len(reads)))
+
+    def find(i):
+        while chain_head[i] != i:
+            chain_head[i] = chain_head[chain_head[i]]
+            i = chain_head[i]
+        return i
+
+    for olap, i, j in edges:
+        if i in successor or j in predecessor:
+            continue
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j:
+            continue
+        successor[i] = (j, olap)
+        predecessor[j] = i
+        chain_head[root_j] = root_i
+
+    contigs = []
+    for start in range(len(reads)):
+        if start in predecessor:
+            continue
+        parts = [reads[start]]
+        node = start
+        while node in successor:
+            node, olap = successor[node]
+            parts.append(reads[node][olap:])
+        contigs.append("".join(parts))
+    contigs.sort(key=len, reverse=True)
+    return contigs
+
+
+def shortest_superstring(reads):
+    # Exact shortest common superstring by dynamic programming over subsets (Held-Karp);
+    # only practical for a handful of reads
+    reads = remove_contained([str(r) for r in reads if len(r)], 1)
+    n = len(reads)
+    if n == 0:
+        return ""
+    olap = [[get_overlap(a, b) if i != j else 0 for j, b in enumerate(reads)] for i, a in enumerate(reads)]
+    full = (1 << n) - 1
+    # best[mask][j]: longest total overlap of a path over mask ending at read j
+    best = [[-1] * n for _ in range(1 << n)]
+    parent = [[-1] * n for _ in range(1 << n)]
+    for j in range(n):
+        best[1 << j][j] = 0
+    for mask in range(1, full + 1):
+        for j in range(n):
+            if best[mask][j] < 0:
+                continue
+            for k in range(n):
+                if mask & (1 << k):
+                    continue
+                nxt = mask | (1 << k)
+                score = best[mask][j] + olap[j][k]
+                if score > best[nxt][k]:
+                    best[nxt][k] = score
+                    parent[nxt][k] = j
+    j = max(range(n), key=lambda j: best[full][j])
+    mask = full
+    order = []
+    while j >= 0:
+        order.append(j)
+        j, mask = parent[mask][j], mask & ~(1 << j)
+    order.reverse()
+    result = reads[order[0]]
+    for prev, cur in zip(order, order[1:]):
+        result += reads[cur][olap[prev][cur]:]
+    return result
+
+
+EXACT_ASSEMBLY_LIMIT = 10
+
+
+def auto_assemble(reads, min_overlap=DEFAULT_MIN_OVERLAP):
+    # Small read sets are solved exactly; anything larger goes to the greedy overlap-graph solver
+    if len(set(map(str, reads))) <= EXACT_ASSEMBLY_LIMIT:
+        return [shortest_superstring(reads)]
+    return greedy_assemble(reads, min_overlap)
+
+
+def check_assembly(contigs, reference):
+    reference = str(reference)
+    longest = contigs[0] if contigs else ""
+    return {
+        "contigs": len(contigs),
+        "total_length": sum(len(c) for c in contigs),
+        "longest_contig": len(longest),
+        "matches_reference": len(contigs) == 1 and longest == reference,
+        "contained_in_reference": all(c in reference for c in contigs),
+    }
+
+
+def contig_n50(contigs):
+    lengths = sorted((len(c) for c in contigs), reverse=True)
+    half, running = sum(lengths) / 2, 0
+    for length in lengths:
+        running += length
+        if running >= half:
+            return length
+    return 0
+
+
+def random_reference(length, seed=None):
+    return decode_sequence(np.random.default_rng(seed).integers(0, 4, size=length, dtype=np.uint8))
+
+
+# --- Read simulation ---
+def simulate_read_batches(reference, coverage=20, read_length=100, error_rate=0.001, seed=None, batch_size=50000):
+    # Yields (n, read_length) uint8 code arrays of reads sampled uniformly from the forward strand,
+    # with substitution errors at error_rate
+    ref_codes = encode_sequence(reference)
+    read_length = min(read_length, ref_codes.size)
+    n_reads = int(np.ceil(coverage * ref_codes.size / read_length))
+    rng = np.random.default_rng(seed)
+    offsets = np.arange(read_length)
+    for batch_start in range(0, n_reads, batch_size):
+        n = min(batch_size, n_reads - batch_start)
+        starts = rng.integers(0, ref_codes.size - read_length + 1, size=n)
+        reads = ref_codes[starts[:, None] + offsets]
+        errors = rng.random(reads.shape) < error_rate
+        # Adding 1-3 modulo 4 always lands on a different base
+        reads[errors] = (reads[errors] + rng.integers(1, 4, size=int(errors.sum()), dtype=np.uint8)) % 4
+        yield reads
+
+
+def simulate_reads(reference, coverage=20, read_length=100, error_rate=0.001, seed=None):
+    return np.concatenate(list(simulate_read_batches(reference, coverage, read_length, error_rate, seed)))
+
+
+# --- De Bruijn graph ---
+_EMPTY = np.uint64(np.iinfo(np.uint64).max)
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class KmerCounter:
+    # Open-addressing hash table (linear probing) of 2-bit packed k-mers held in two NumPy
+    # arrays; batches are inserted with vectorized probing rather than one key at a time
+    def __init__(self, k, capacity=1 << 16):
+        if not 1 <= k <= 31:
+            raise ValueError("k must be between 1 and 31.")
+        self.k = k
+        self.size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self._bits = max(4, int(np.ceil(np.log2(capacity))))
+        self.keys = np.full(1 << self._bits, _EMPTY, dtype=np.uint64)
+        self.counts = np.zeros(1 << self._bits, dtype=np.uint32)
+
+    @property
+    def capacity(self):
+        return self.keys.size
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.counts.nbytes
+
+    def _slots(self, keys):
+        return ((keys * _HASH_MULTIPLIER) >> np.uint64(64 - self._bits)).astype(np.int64)
+
+    def _insert_unique(self, keys, counts):
+        mask = self.capacity - 1
+        slots = self._slots(keys)
+        while keys.size:
+            current = self.keys[slots]
+            hit = current == keys
+            self.counts[slots[hit]] += counts[hit]
+            empty = current == _EMPTY
+            # Several keys may race for the same empty slot; the last write wins and the rest probe on
+            self.keys[slots[empty]] = keys[empty]
+            won = np.zeros_like(empty)
+            won[empty] = self.keys[slots[empty]] == keys[empty]
+            self.counts[slots[won]] = counts[won]
+            self.size += int(won.sum())
+            pending = ~(hit | won)
+            keys, counts, slots = keys[pending], counts[pending], (slots[pending] + 1) & mask
+
+    def _find(self, keys):
+        # Slot of each key, or -1 where the key is not in the table
+        mask = self.capacity - 1
+        found = np.full(keys.size, -1, dtype=np.int64)
+        pending = np.arange(keys.size)
+        slots = self._slots(keys)
+        while pending.size:
+            current = self.keys[slots]
+            hit = current == keys[pending]
+            found[pending[hit]] = slots[hit]
+            probing = ~hit & (current != _EMPTY)
+            pending, slots = pending[probing], (slots[probing] + 1) & mask
+        return found
+
+    def add(self, kmers):
+        keys, counts = np.unique(kmers, return_counts=True)
+        counts = counts.astype(np.uint32)
+        # At high coverage most keys of a batch are already counted; only the missing ones take
+        # new slots, so the table is grown (to at most half full) by those alone
+        slots = self._find(keys)
+        present = slots >= 0
+        n_missing = keys.size - int(present.sum())
+        if (self.size + n_missing) * 2 > self.capacity:
+            old_keys, old_counts = self.items()
+            self._allocate(2 * (self.size + n_missing))
+            self.size = 0
+            self._insert_unique(old_keys, old_counts)
+            self._insert_unique(keys, counts)
+            return
+        self.counts[slots[present]] += counts[present]
+        self._insert_unique(keys[~present], counts[~present])
+
+    def items(self):
+        occupied = self.keys != _EMPTY
+        return self.keys[occupied], self.counts[occupied]
+
+
+def extract_kmers(codes, k):
+    # All k-mers of each row (or of a single 1-D sequence) packed 2 bits per base into uint64.
+    # Blocks of 1, 2, 4, 8... bases are built by doubling and combined along the binary digits
+    # of k, so this takes O(log k) array passes instead of k
+    codes = np.atleast_2d(codes)
+    length = codes.shape[1]
+    if length < k:
+        return np.empty(0, dtype=np.uint64)
+    block, block_len = codes.astype(np.uint64), 1
+    kmers, kmer_len = None, 0
+    while block_len <= k:
+        if k & block_len:
+            if kmers is None:
+                kmers, kmer_len = block, block_len
+            else:
+                width = length - kmer_len - block_len + 1
+                kmers = (kmers[:, :width] << np.uint64(2 * block_len)) | block[:, kmer_len:kmer_len + width]
+                kmer_len += block_len
+        width = length - 2 * block_len + 1
+        if width <= 0:
+            break
+        block = (block[:, :width] << np.uint64(2 * block_len)) | block[:, block_len:block_len + width]
+        block_len *= 2
+    return kmers.reshape(-1)
+
+
+def count_kmers(read_batches, k):
+    counter = KmerCounter(k)
+    for batch in read_batches:
+        if isinstance(batch, PackedSequence):
+            batch = batch.codes()
+        counter.add(extract_kmers(batch, k))
+    return counter
+
+
+def _unpack_kmers(kmers, k):
+    shifts = np.uint64(2) * np.arange(k - 1, -1, -1, dtype=np.uint64)
+    return ((kmers[:, None] >> shifts) & np.uint64(3)).astype(np.uint8)
+
+
+def compact_unitigs(kmers, k):
+    # Each solid k-mer is an edge between its (k-1)-mer prefix and suffix; an edge continues into
+    # the next one when the node between them has exactly one way in and one way out
+    n = kmers.size
+    if n == 0:
+        return []
+    node_mask = np.uint64((1 << (2 * (k - 1))) - 1)
+    prefixes = kmers >> np.uint64(2)
+    suffixes = kmers & node_mask
+    by_prefix = np.argsort(prefixes)
+    sorted_prefixes = prefixes[by_prefix]
+    # Degrees are looked up with sorted queries, which keeps searchsorted cache-friendly
+    by_suffix = np.argsort(suffixes)
+    sorted_suffixes = suffixes[by_suffix]
+    first_out = np.empty(n, dtype=np.int64)
+    out_degree = np.empty(n, dtype=np.int64)
+    in_degree = np.empty(n, dtype=np.int64)
+    first_out[by_suffix] = np.searchsorted(sorted_prefixes, sorted_suffixes, side="left")
+    out_degree[by_suffix] = np.searchsorted(sorted_prefixes, sorted_suffixes, side="right") - first_out[by_suffix]
+    group_starts = np.flatnonzero(np.diff(sorted_suffixes, prepend=sorted_suffixes[0] + np.uint64(1)))
+    group_sizes = np.diff(np.append(group_starts, n))
+    in_degree[by_suffix] = np.repeat(group_sizes, group_sizes)
+    linked = (out_degree == 1) & (in_degree == 1)
+    nxt = np.full(n, -1, dtype=np.int64)
+    nxt[linked] = by_prefix[first_out[linked]]
+    prev = np.full(n, -1, dtype=np.int64)
+    prev[nxt[linked]] = np.flatnonzero(linked)
+
+    # List ranking by pointer jumping: after log2(n) rounds every edge on a path knows its head
+    # and its distance from it
+    is_head = prev == -1
+    ancestor = np.where(is_head, np.arange(n), prev)
+    rank = (~is_head).astype(np.int64)
+    for _ in range(int(np.ceil(np.log2(n))) + 1):
+        rank = rank + rank[ancestor]
+        ancestor = ancestor[ancestor]
+    on_path = is_head[ancestor]
+
+    last_bases = (kmers & np.uint64(3)).astype(np.uint8)
+    order = np.flatnonzero(on_path)
+    order = order[np.lexsort((rank[order], ancestor[order]))]
+    head_positions = np.flatnonzero(is_head[order])
+    # A path is its head k-mer followed by the last base of every later edge
+    chunk = np.where(is_head[order], k, 1)
+    starts = np.concatenate(([0], np.cumsum(chunk)[:-1]))
+    out = np.empty(int(chunk.sum()), dtype=np.uint8)
+    tails = ~is_head[order]
+    out[starts[tails]] = last_bases[order[tails]]
+    out[starts[head_positions][:, None] + np.arange(k)] = _unpack_kmers(kmers[order[head_positions]], k)
+    unitigs = [decode_sequence(part) for part in np.split(out, starts[head_positions][1:])] if order.size else []
+
+    # Whatever is left forms isolated cycles; walk each one once
+    visited = on_path.copy()
+    for e in np.flatnonzero(~on_path):
+        if visited[e]:
+            continue
+        bases = list(_unpack_kmers(kmers[e:e + 1], k)[0])
+        visited[e] = True
+        node = nxt[e]
+        while node != e and not visited[node]:
+            visited[node] = True
+            bases.append(last_bases[node])
+            node = nxt[node]
+        unitigs.append(decode_sequence(np.array(bases, dtype=np.uint8)))
+    return unitigs
+
+
+def debruijn_assemble(read_batches, k=31, min_count=2, min_contig_length=0):
+    # Count k-mers, drop those seen fewer than min_count times as sequencing errors, and
+    # return the compacted unitigs longest first along with the k-mer counter
+    counter = count_kmers(read_batches, k)
+    kmers, counts = counter.items()
+    solid = kmers[counts >= min_count]
+    contigs = [c for c in compact_unitigs(solid, k) if len(c) >= min_contig_length]
+    contigs.sort(key=len, reverse=True)
+    return contigs, counter
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+# Numeric columns with more distinct values than this are bucketed into quantile bins, and
+# the joint table over all columns is only built when it has at most MAX_CUBE_CELLS cells
+MAX_LEVELS = 256
+MAX_CUBE_CELLS = 1 << 22
+
+
+def _encode(column):
+    # Integer codes plus the value of every level (None for nominal columns)
+    if isinstance(column.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(column):
+        codes, _ = pd.factorize(column, sort=True)
+        return codes.astype(np.int64), None
+    values = column.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    codes = np.full(values.size, -1, dtype=np.int64)
+    levels, codes[valid] = np.unique(values[valid], return_inverse=True)
+    if levels.size > MAX_LEVELS:
+        edges = np.unique(np.quantile(values[valid], np.linspace(0, 1, MAX_LEVELS + 1)))
+        codes[valid] = np.clip(np.searchsorted(edges, values[valid], side="right") - 1, 0, edges.size - 2)
+        levels = np.bincount(codes[valid], weights=values[valid]) / np.maximum(np.bincount(codes[valid]), 1)
+    return codes, levels
+
+
+def cramers_v(table):
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    n = table.sum()
+    if n == 0 or min(table.shape) < 2:
+        return np.nan
+    expected = table.sum(axis=1, keepdims=True) * table.sum(axis=0, keepdims=True) / n
+    chi2 = ((table - expected) ** 2 / expected).sum()
+    return float(np.sqrt(chi2 / n / (min(table.shape) - 1)))
+
+
+def correlation_ratio(table, levels):
+    # table: categories x numeric levels
+    n = table.sum()
+    if n == 0:
+        return np.nan
+    mean = (table.sum(axis=0) * levels).sum() / n
+    total = (table.sum(axis=0) * (levels - mean) ** 2).sum()
+    if total == 0:
+        return np.nan
+    group_n = table.sum(axis=1)
+    group_mean = (table * levels).sum(axis=1) / np.maximum(group_n, 1)
+    return float(np.sqrt((group_n * (group_mean - mean) ** 2).sum() / total))
+
+
+def pearson(table, x_levels, y_levels):
+    n = table.sum()
+    if n == 0:
+        return np.nan
+    px, py = table.sum(axis=1) / n, table.sum(axis=0) / n
+    mx, my = (px * x_levels).sum(), (py * y_levels).sum()
+    cov = (table / n * np.outer(x_levels - mx, y_levels - my)).sum()
+    sx, sy = np.sqrt((px * (x_levels - mx) ** 2).sum()), np.sqrt((py * (y_levels - my) ** 2).sum())
+    return float(cov / (sx * sy)) if sx > 0 and sy > 0 else np.nan
+
+
+def _measure(table, levels_a, levels_b):
+    if levels_a is None and levels_b is None:
+        return cramers_v(table), "Cramér's V"
+    if levels_a is None:
+        return correlation_ratio(table, levels_b), "correlation ratio"
+    if levels_b is None:
+        return correlation_ratio(table.T, levels_a), "correlation ratio"
+    return pearson(table, levels_a, levels_b), "Pearson"
+
+
+def _pair_tables(codes, sizes):
+    # Contingency table of every column pair. When the joint table over all columns is small
+    # it is counted in a single bincount pass and each pair table is a marginal of it.
+    n_cols = len(codes)
+    pairs = [(i, j) for i in range(n_cols) for j in range(i + 1, n_cols)]
+    if np.prod(sizes, dtype=float) <= MAX_CUBE_CELLS:
+        joint = np.ravel_multi_index(codes, sizes)
+        cube = np.bincount(joint, minlength=int(np.prod(sizes))).reshape(sizes)
+        return {(i, j): cube.sum(axis=tuple(k for k in range(n_cols) if k not in (i, j))) for i, j in pairs}
+    return {(i, j): np.bincount(codes[i] * sizes[j] + codes[j], minlength=sizes[i] * sizes[j]).reshape(sizes[i], sizes[j])
+            for i, j in pairs}
+
+
+def association_matrix(df, columns, sample_size=None, n_boot=200, seed=0):
+    # Pairwise association of columns: Cramér's V between nominal columns, the correlation
+    # ratio between a nominal and a numeric column and Pearson's r between numeric columns.
+    # With sample_size, a uniform row sample is used and "error" holds the half-width of a
+    # 95% bootstrap interval for each entry (the bootstrap resamples the contingency tables,
+    # not the rows).
+    rng = np.random.default_rng(seed)
+    if sample_size is not None and sample_size < len(df):
+        df = df.iloc[np.sort(rng.choice(len(df), sample_size, replace=False))]
+    else:
+        sample_size = None
+    encoded = [_encode(df[col]) for col in columns]
+    levels = [l for _, l in encoded]
+    # Rows with a missing value in any column are left out
+    complete = np.logical_and.reduce([c >= 0 for c, _ in encoded])
+    codes = [c[complete] for c, _ in encoded]
+    sizes = tuple(max(int(c.max()) + 1 if c.size else 1, 1) for c, _ in encoded)
+    tables = _pair_tables(codes, sizes)
+
+    matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+    methods = pd.DataFrame("", index=columns, columns=columns)
+    error = pd.DataFrame(0.0, index=columns, columns=columns) if sample_size else None
+    for (i, j), table in tables.items():
+        value, method = _measure(table.astype(float), levels[i], levels[j])
+        matrix.iat[i, j] = matrix.iat[j, i] = value
+        methods.iat[i, j] = methods.iat[j, i] = method
+        if error is not None and table.sum() > 0:
+            draws = rng.multinomial(int(table.sum()), (table / table.sum()).ravel(), size=n_boot)
+            boot = [_measure(d.reshape(table.shape).astype(float), levels[i], levels[j])[0] for d in draws]
+            low, high = np.nanpercentile(boot, [2.5, 97.5])
+            error.iat[i, j] = error.iat[j, i] = float(high - low) / 2
+    return {"matrix": matrix, "methods": methods, "error": error, "rows": len(df)}
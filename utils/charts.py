@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Charts get summary data only: rows are binned or counted here and at most MAX_LINE_POINTS
+# points per series are drawn. Traces with more than WEBGL_POINTS points use WebGL.
+MAX_LINE_POINTS = 2000
+WEBGL_POINTS = 1000
+
+
+def binned_counts(values, counts, nbins):
+    # Histogram of already-counted values (e.g. the age histogram in the trait index):
+    # returns one row per bin with its start, end and total count
+    values = np.asarray(values, dtype=float)
+    counts = np.asarray(counts)
+    if values.size == 0:
+        return pd.DataFrame({"start": [], "end": [], "count": []})
+    low, high = values.min(), values.max() + 1
+    totals, edges = np.histogram(values, bins=min(nbins, int(high - low)), range=(low, high), weights=counts)
+    return pd.DataFrame({"start": edges[:-1], "end": edges[1:], "count": totals.astype(np.int64)})
+
+
+def histogram_figure(bins, x_label, title):
+    # A bar chart shaped like px.histogram, drawn from binned_counts()
+    import plotly.express as px
+    fig = px.bar(x=(bins["start"] + bins["end"]) / 2, y=bins["count"], title=title,
+                 labels={"x": x_label, "y": "count"})
+    fig.update_traces(width=bins["end"] - bins["start"], marker_line_width=1)
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def downsample(df, max_points=MAX_LINE_POINTS):
+    # Keeps the first and last row plus the min and max of every column in each bucket, so
+    # peaks survive the thinning
+    if len(df) <= max_points:
+        return df
+    n_buckets = max(1, max_points // (2 * len(df.columns)))
+    bucket = np.arange(len(df)) * n_buckets // len(df)
+    keep = {0, len(df) - 1}
+    for col in df.columns:
+        grouped = pd.Series(df[col].to_numpy(dtype=float)).groupby(bucket)
+        keep.update(grouped.idxmin().dropna().astype(int))
+        keep.update(grouped.idxmax().dropna().astype(int))
+    return df.iloc[sorted(keep)]
+
+
+def line_figure(df, title=None, max_points=MAX_LINE_POINTS):
+    # Line chart of every column of df against its index
+    import plotly.express as px
+    thinned = downsample(df, max_points)
+    n_points = thinned.size
+    return px.line(thinned, title=title, render_mode="webgl" if n_points > WEBGL_POINTS else "svg")
+
+
+def plotly_chart(fig, name, **kwargs):
+    # st.plotly_chart that records the size of the figure JSON sent to the browser
+    st.session_state.setdefault("chart_payloads", {})[name] = len(fig.to_json())
+    return st.plotly_chart(fig, **kwargs)
+
+
+def payload_report():
+    payloads = st.session_state.get("chart_payloads", {})
+    return pd.DataFrame({"chart": list(payloads), "bytes": list(payloads.values())})
@@ -0,0 +1,158 @@
+import os
+import json
+import stat
+import hashlib
+import tempfile
+import pandas as pd
+import streamlit as st
+
+# Caches live under the user's own cache directory, not the shared temp directory: uploads hold
+# personal data, and whatever is in a cache is read back as trusted
+USER_CACHE_ROOT = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "genetic_traits")
+CACHE_DIR = os.environ.get("DATASET_CACHE_DIR", os.path.join(USER_CACHE_ROOT, "datasets"))
+CACHE_BUDGET = int(os.environ.get("DATASET_CACHE_BUDGET_MB", 512)) * 1024 * 1024
+HASH_CHUNK_SIZE = 1 << 20
+
+# Streamlit gives every upload a file_id that stays the same across reruns, so an upload
+# only has to be hashed once
+_upload_hashes = {}
+
+
+def private_dir(path):
+    # Creates path with mode 0700 if needed. Returns True when it belongs to this user and is
+    # closed to everyone else (tightening our own directory if it is not); callers skip the
+    # disk cache otherwise.
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.stat(path)
+        if hasattr(os, "getuid") and info.st_uid != os.getuid():
+            return False
+        if info.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+            os.chmod(path, 0o700)
+    except OSError:
+        return False
+    return True
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@st.cache_resource(scope="session", show_spinner=False, on_release=_remove_file)
+def session_temp_file(path):
+    # Ties a temporary file to the current session: it is deleted when the session ends, or
+    # earlier with release_temp_file(). Callers should check it still exists before reusing it.
+    return path
+
+
+def release_temp_file(path):
+    session_temp_file.clear(path)
+    _remove_file(path)
+
+
+def spool_upload(uploaded_file, prefix="upload_", chunk_size=HASH_CHUNK_SIZE):
+    # Copies an upload to a temporary file in chunks so it can be read back from disk
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, prefix=prefix) as out:
+        uploaded_file.seek(0)
+        while chunk := uploaded_file.read(chunk_size):
+            out.write(chunk)
+    uploaded_file.seek(0)
+    return out.name
+
+
+def content_hash(source, chunk_size=HASH_CHUNK_SIZE):
+    # Hash of the raw bytes of an upload or file path, read in chunks
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            while chunk := f.read(chunk_size):
+                digest.update(chunk)
+    else:
+        file_id = getattr(source, "file_id", None)
+        if file_id in _upload_hashes:
+            return _upload_hashes[file_id]
+        source.seek(0)
+        while chunk := source.read(chunk_size):
+            digest.update(chunk)
+        source.seek(0)
+        if file_id is not None:
+            if len(_upload_hashes) >= 1000:
+                _upload_hashes.clear()
+            _upload_hashes[file_id] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+def _paths(key, cache_dir):
+    return os.path.join(cache_dir, f"{key}.parquet"), os.path.join(cache_dir, f"{key}.json")
+
+
+def _entries(cache_dir):
+    # (last used, size, key) for every cached frame, oldest first
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".parquet"):
+            continue
+        key = name[:-len(".parquet")]
+        try:
+            size = sum(os.path.getsize(p) for p in _paths(key, cache_dir) if os.path.exists(p))
+            entries.append((os.path.getmtime(os.path.join(cache_dir, name)), size, key))
+        except OSError:
+            continue
+    return sorted(entries)
+
+
+def evict(cache_dir=CACHE_DIR, budget=CACHE_BUDGET, keep=None):
+    # Removes the least recently used frames until the cache fits in the budget
+    entries = _entries(cache_dir)
+    total = sum(size for _, size, _ in entries)
+    for _, size, key in entries:
+        if total <= budget:
+            break
+        if key == keep:
+            continue
+        for path in _paths(key, cache_dir):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        total -= size
+
+
+def cached_load(source, loader, namespace="", cache_dir=CACHE_DIR, budget=CACHE_BUDGET):
+    # Returns loader(source) -> (frame, report), stored as Parquet under a hash of the
+    # content so the same file is only parsed once. The report must be JSON-serialisable
+    # apart from DataFrame values, which are stored as lists of records.
+    if not private_dir(cache_dir):
+        return loader(source)
+    key = f"{namespace}{content_hash(source)}"
+    frame_path, report_path = _paths(key, cache_dir)
+    try:
+        df = pd.read_parquet(frame_path)
+        with open(report_path) as f:
+            report = json.load(f)
+        os.utime(frame_path)
+        for name, value in report.pop("_frames", {}).items():
+            report[name] = pd.DataFrame(value["records"], columns=value["columns"])
+        return df, report
+    except (OSError, ValueError):
+        pass
+
+    df, report = loader(source)
+    stored = {k: v for k, v in report.items() if not isinstance(v, pd.DataFrame)}
+    stored["_frames"] = {k: {"columns": list(v.columns), "records": v.to_dict("records")}
+                         for k, v in report.items() if isinstance(v, pd.DataFrame)}
+    try:
+        # Write under temporary names first so a concurrent reader never sees a partial file
+        df.to_parquet(frame_path + ".tmp", index=False)
+        with open(report_path + ".tmp", "w") as f:
+            json.dump(stored, f, default=int)
+        os.replace(report_path + ".tmp", report_path)
+        os.replace(frame_path + ".tmp", frame_path)
+        evict(cache_dir, budget, keep=key)
+    except OSError:
+        pass
+    return df, report
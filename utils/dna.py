@@ -0,0 +1,153 @@
+import numpy as np
+
+BASES = "ATCG"
+
+# Lookup table mapping ASCII bytes to base codes (255 marks an invalid byte)
+_ENCODE_TABLE = np.full(256, 255, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _ENCODE_TABLE[ord(_base)] = _code
+_DECODE_TABLE = np.frombuffer(BASES.encode("ascii"), dtype=np.uint8)
+
+# Number of differing 2-bit lanes in an XOR-ed byte
+_LANE_DIFF = np.array([bin((x | (x >> 1)) & 0x55).count("1") for x in range(256)], dtype=np.uint8)
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+
+
+def encode_sequence(seq):
+    if isinstance(seq, PackedSequence):
+        return seq.codes()
+    raw = np.frombuffer(seq.encode("ascii", errors="replace"), dtype=np.uint8)
+    codes = _ENCODE_TABLE[raw]
+    if codes.size == 0 or (codes == 255).any():
+        raise ValueError("Invalid sequence. Only letters A, T, C, G allowed.")
+    return codes
+
+
+def decode_sequence(codes):
+    return _DECODE_TABLE[np.asarray(codes, dtype=np.uint8)].tobytes().decode("ascii")
+
+
+def pack_codes(codes):
+    codes = np.asarray(codes, dtype=np.uint8)
+    padded = np.zeros(-(-codes.size // 4) * 4, dtype=np.uint8)
+    padded[:codes.size] = codes
+    lanes = padded.reshape(-1, 4) << _SHIFTS
+    return lanes[:, 0] | lanes[:, 1] | lanes[:, 2] | lanes[:, 3]
+
+
+def unpack_codes(packed, start, length):
+    first, last = start // 4, -(-(start + length) // 4)
+    lanes = (packed[first:last, None] >> _SHIFTS) & 3
+    offset = start - 4 * first
+    return lanes.reshape(-1)[offset:offset + length]
+
+
+class PackedSequence:
+    # DNA stored 2 bits per base, 4 bases per byte (first base in the high bits).
+    # Slices are views over the same buffer, so point edits through a slice are visible in
+    # the sequence it was taken from, as with NumPy arrays.
+    __slots__ = ("_data", "_start", "_length")
+
+    def __init__(self, seq="", _data=None, _start=0, _length=None):
+        if _data is None:
+            codes = encode_sequence(seq) if len(seq) else np.empty(0, dtype=np.uint8)
+            _data = pack_codes(codes)
+            _length = codes.size
+        self._data = _data
+        self._start = _start
+        self._length = _length
+
+    @classmethod
+    def from_codes(cls, codes):
+        codes = np.asarray(codes, dtype=np.uint8)
+        return cls(_data=pack_codes(codes), _length=codes.size)
+
+    def codes(self):
+        return unpack_codes(self._data, self._start, self._length)
+
+    def copy(self):
+        return PackedSequence.from_codes(self.codes())
+
+    @property
+    def nbytes(self):
+        return -(-(self._start % 4 + self._length) // 4)
+
+    def __len__(self):
+        return self._length
+
+    def _index(self, i):
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("PackedSequence index out of range")
+        return divmod(self._start + i, 4)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return PackedSequence.from_codes(self.codes()[key])
+            return PackedSequence(_data=self._data, _start=self._start + start, _length=max(0, stop - start))
+        byte, lane = self._index(key)
+        return BASES[(self._data[byte] >> _SHIFTS[lane]) & 3]
+
+    def __setitem__(self, key, base):
+        code = BASES.find(base)
+        if len(base) != 1 or code < 0:
+            raise ValueError("Invalid sequence. Only letters A, T, C, G allowed.")
+        byte, lane = self._index(key)
+        shift = _SHIFTS[lane]
+        self._data[byte] = (self._data[byte] & ~np.uint8(3 << shift)) | np.uint8(code << shift)
+
+    def _aligned(self):
+        # Bytes holding this sequence with its first base in the first lane; a view unless the
+        # slice starts mid-byte
+        if self._start % 4 == 0:
+            first = self._start // 4
+            return self._data[first:first + self.nbytes]
+        return pack_codes(self.codes())
+
+    def hamming(self, other):
+        if not isinstance(other, PackedSequence):
+            other = PackedSequence(other)
+        if len(other) != self._length:
+            raise ValueError("Hamming distance needs sequences of equal length.")
+        if self._length == 0:
+            return 0
+        diff = self._aligned() ^ other._aligned()
+        full, tail = divmod(self._length, 4)
+        distance = int(_LANE_DIFF[diff[:full]].sum(dtype=np.int64))
+        if tail:
+            # Ignore the padding lanes past the end of the sequence
+            distance += int(_LANE_DIFF[diff[full] & np.uint8((0xFF << (8 - 2 * tail)) & 0xFF)])
+        return distance
+
+    def insert(self, i, base):
+        return PackedSequence.from_codes(np.insert(self.codes(), i, BASES.index(base)))
+
+    def delete(self, i):
+        return PackedSequence.from_codes(np.delete(self.codes(), i))
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __str__(self):
+        return decode_sequence(self.codes())
+
+    def __repr__(self):
+        text = str(self) if self._length <= 40 else f"{self[:20]}…{self[-20:]}"
+        return f"PackedSequence('{text}', length={self._length})"
+
+    def __eq__(self, other):
+        if isinstance(other, str):
+            return str(self) == other
+        if isinstance(other, PackedSequence):
+            return self._length == other._length and self.hamming(other) == 0
+        return NotImplemented
+
+
+def abbreviate_sequence(seq, limit=200):
+    if len(seq) <= limit:
+        return str(seq)
+    half = limit // 2
+    return f"{seq[:half]}…{seq[-half:]} ({len(seq):,} bases)"
@@ -0,0 +1,248 @@
+import os
+import sys
+import time
+import types
+import random
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+import numpy as np
+from utils.dna import PackedSequence, decode_sequence, encode_sequence
+
+
+# --- Reference engine (pure Python, one base at a time) ---
+def fitness(seq, target):
+    if isinstance(seq, PackedSequence) or isinstance(target, PackedSequence):
+        packed = seq if isinstance(seq, PackedSequence) else PackedSequence(seq)
+        return 1 - packed.hamming(target) / len(target)
+    return sum(a == b for a, b in zip(seq, target)) / len(target)
+
+
+def evolve(target, pop_size, mutation_rate, max_gens, stop_event=None):
+    # stop_event (optional) is checked once per generation and ends the run early when set
+    target = str(target)
+    population = [''.join(random.choices('ATCG', k=len(target))) for _ in range(pop_size)]
+    best_seq = ""
+    best_fit = 0
+    generations = 0
+    for g in range(max_gens):
+        if stop_event is not None and stop_event.is_set():
+            generations = g
+            break
+        fitnesses = [fitness(seq, target) for seq in population]
+        best_idx = np.argmax(fitnesses)
+        if fitnesses[best_idx] > best_fit:
+            best_fit = fitnesses[best_idx]
+            best_seq = population[best_idx]
+        if best_fit == 1.0:
+            generations = g + 1
+            break
+        selected = random.choices(population, weights=fitnesses, k=pop_size)
+        new_pop = []
+        for i in range(pop_size):
+            parent = selected[random.randint(0, pop_size-1)]
+            child = list(parent)
+            for j in range(len(child)):
+                if random.random() < mutation_rate:
+                    child[j] = random.choice('ATCG')
+            new_pop.append(''.join(child))
+        population = new_pop
+    else:
+        generations = max_gens
+    return best_seq, best_fit, generations
+
+
+# --- Vectorized engine (population held as a 2-D uint8 array) ---
+def fitness_numpy(population, target_codes):
+    return np.count_nonzero(population == target_codes, axis=1) / target_codes.size
+
+
+def select_parents(fitnesses, rng):
+    # Fitness-proportionate selection; falls back to uniform when every score is zero
+    total = fitnesses.sum()
+    if total <= 0:
+        return rng.integers(0, len(fitnesses), size=len(fitnesses))
+    cumulative = np.cumsum(fitnesses)
+    picks = rng.random(len(fitnesses)) * total
+    return np.minimum(np.searchsorted(cumulative, picks, side="right"), len(fitnesses) - 1)
+
+
+def mutate_population(population, mutation_rate, rng):
+    # Draw the number of mutated bases once, then scatter them, instead of one draw per base
+    flat = population.reshape(-1)
+    n_mutations = rng.binomial(flat.size, mutation_rate)
+    positions = rng.integers(0, flat.size, size=n_mutations)
+    flat[positions] = rng.integers(0, 4, size=n_mutations, dtype=np.uint8)
+    return population
+
+
+def run_generations(population, target_codes, mutation_rate, n_gens, rng, stop_event=None):
+    best_codes = None
+    best_fit = 0
+    for g in range(n_gens):
+        if stop_event is not None and stop_event.is_set():
+            return population, best_codes, best_fit, g
+        fitnesses = fitness_numpy(population, target_codes)
+        best_idx = int(np.argmax(fitnesses))
+        if fitnesses[best_idx] > best_fit:
+            best_fit = float(fitnesses[best_idx])
+            best_codes = population[best_idx].copy()
+        if best_fit == 1.0:
+            return population, best_codes, best_fit, g + 1
+        population = mutate_population(population[select_parents(fitnesses, rng)], mutation_rate, rng)
+    return population, best_codes, best_fit, n_gens
+
+
+def evolve_numpy(target, pop_size, mutation_rate, max_gens, seed=None, stop_event=None):
+    target_codes = encode_sequence(target)
+    rng = np.random.default_rng(seed)
+    population = rng.integers(0, 4, size=(pop_size, target_codes.size), dtype=np.uint8)
+    _, best_codes, best_fit, generations = run_generations(population, target_codes, mutation_rate, max_gens, rng,
+                                                           stop_event=stop_event)
+    best_seq = decode_sequence(best_codes) if best_codes is not None else ""
+    return best_seq, best_fit, generations
+
+
+def evolve_stream(target, pop_size, mutation_rate, max_gens, stagnation_window=None, time_budget=None, seed=None):
+    # Yields one stats dict per generation; the final (best_seq, best_fit, generations, stop_reason)
+    # tuple is the generator's return value
+    target_codes = encode_sequence(target)
+    rng = np.random.default_rng(seed)
+    population = rng.integers(0, 4, size=(pop_size, target_codes.size), dtype=np.uint8)
+    best_codes = None
+    best_fit = 0
+    last_improvement = 0
+    stop_reason = "max generations"
+    start = time.perf_counter()
+    generations = max_gens
+    for g in range(max_gens):
+        gen_start = time.perf_counter()
+        fitnesses = fitness_numpy(population, target_codes)
+        best_idx = int(np.argmax(fitnesses))
+        if fitnesses[best_idx] > best_fit:
+            best_fit = float(fitnesses[best_idx])
+            best_codes = population[best_idx].copy()
+            last_improvement = g
+        if best_fit < 1.0:
+            population = mutate_population(population[select_parents(fitnesses, rng)], mutation_rate, rng)
+        yield {
+            "generation": g + 1,
+            "best_fitness": float(fitnesses[best_idx]),
+            "best_so_far": best_fit,
+            "mean_fitness": float(fitnesses.mean()),
+            "fitness_std": float(fitnesses.std()),
+            "seconds": time.perf_counter() - gen_start,
+        }
+        if best_fit == 1.0:
+            stop_reason = "solved"
+        elif stagnation_window and g - last_improvement >= stagnation_window:
+            stop_reason = "stagnation"
+        elif time_budget and time.perf_counter() - start >= time_budget:
+            stop_reason = "time budget"
+        else:
+            continue
+        generations = g + 1
+        break
+    best_seq = decode_sequence(best_codes) if best_codes is not None else ""
+    return best_seq, best_fit, generations, stop_reason
+
+
+# --- Island model (one sub-population per worker process, ring migration) ---
+_island_stop_event = None
+
+
+def _init_island_worker(stop_event):
+    global _island_stop_event
+    _island_stop_event = stop_event
+
+
+def _run_island_epoch(population, target_codes, mutation_rate, n_gens, rng):
+    population, best_codes, best_fit, gens = run_generations(
+        population, target_codes, mutation_rate, n_gens, rng, stop_event=_island_stop_event)
+    if best_fit == 1.0:
+        _island_stop_event.set()
+    return population, best_codes, best_fit, gens, rng
+
+
+@contextlib.contextmanager
+def _hidden_main():
+    # Streamlit installs the running page as __main__, and forkserver/spawn children re-run
+    # __main__ while starting up; the workers only need this module, so hide the page meanwhile
+    page_main = sys.modules.get("__main__")
+    placeholder = types.ModuleType("__main__")
+    sys.modules["__main__"] = placeholder
+    try:
+        yield
+    finally:
+        # Another session's script may have installed its own __main__ in the meantime
+        if sys.modules.get("__main__") is placeholder:
+            sys.modules["__main__"] = page_main
+
+
+def migrate(populations, target_codes, n_migrants):
+    # The best individuals of island i replace the worst of island i+1
+    ranked = [np.argsort(fitness_numpy(pop, target_codes)) for pop in populations]
+    emigrants = [pop[order[-n_migrants:]].copy() for pop, order in zip(populations, ranked)]
+    for i, pop in enumerate(populations):
+        pop[ranked[i][:n_migrants]] = emigrants[i - 1]
+    return populations
+
+
+def evolve_islands(target, pop_size, mutation_rate, max_gens, n_islands=4, migration_interval=20,
+                   n_migrants=None, max_workers=None, seed=None, stop_event=None):
+    # stop_event (optional, e.g. a threading.Event) is passed on to the workers, which stop
+    # within a generation of it being set
+    target_codes = encode_sequence(target)
+    if n_migrants is None:
+        n_migrants = max(1, pop_size // 20)
+    n_migrants = min(n_migrants, pop_size)
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_islands)]
+    populations = [rng.integers(0, 4, size=(pop_size, target_codes.size), dtype=np.uint8) for rng in rngs]
+    best_codes = None
+    best_fit = 0
+    generations = 0
+    max_workers = min(n_islands, max_workers or os.cpu_count() or 1)
+    # The pool is started from a Streamlit server thread, and forking a multithreaded process can
+    # deadlock the child, so workers come from a fork server (or are spawned where there is none)
+    context = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+    if context.get_start_method() == "forkserver":
+        context.set_forkserver_preload([__name__])
+    island_stop = context.Event()
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_init_island_worker,
+                             initargs=(island_stop,)) as pool:
+        while generations < max_gens:
+            if stop_event is not None and stop_event.is_set():
+                break
+            epoch = min(migration_interval, max_gens - generations)
+            # Workers are started on demand by submit()
+            with _hidden_main():
+                futures = [pool.submit(_run_island_epoch, pop, target_codes, mutation_rate, epoch, rng)
+                           for pop, rng in zip(populations, rngs)]
+            pending = futures
+            while pending:
+                # Waited on in short slices so a stop request reaches the workers mid-epoch
+                _, pending = wait(pending, timeout=0.1)
+                if stop_event is not None and stop_event.is_set():
+                    island_stop.set()
+            results = [f.result() for f in futures]
+            populations = [r[0] for r in results]
+            rngs = [r[4] for r in results]
+            solved = [r for r in results if r[2] == 1.0]
+            if solved:
+                _, best_codes, best_fit, gens, _ = min(solved, key=lambda r: r[3])
+                generations += gens
+                break
+            for _, codes, fit, _, _ in results:
+                if fit > best_fit:
+                    best_fit, best_codes = fit, codes
+            generations += epoch
+            if n_islands > 1:
+                populations = migrate(populations, target_codes, n_migrants)
+    best_seq = decode_sequence(best_codes) if best_codes is not None else ""
+    return best_seq, best_fit, generations
+
+
+ENGINES = {
+    "Python (reference)": evolve,
+    "NumPy (vectorized)": evolve_numpy,
+}
@@ -0,0 +1,40 @@
+import importlib
+import time
+import streamlit as st
+
+# Section label -> module in this package. Only the open section runs on a rerun, and its
+# module (with the libraries it needs) is imported the first time it is opened.
+SECTIONS = {
+    "🏠 Homepage": "home",
+    "🧬 Trait Analyzer": "trait_analyzer",
+    "🧪 Mutation Simulator": "mutation_simulator",
+    "🗺️ Chromosome Map (Basic)": "chromosome_map",
+    "🗺️ Chromosome Map (Advanced)": "chromosome_map_advanced",
+    "🧬 Genetic Algorithm Explorer": "ga_explorer",
+    "🧩 Genome Assembly Challenge": "assembly_challenge",
+    "ℹ️ About": "about",
+}
+
+
+def render_section(label, genome_reader, genome_record):
+    # Imports and renders one section, then records how long each step took
+    start = time.perf_counter()
+    module = importlib.import_module(f"{__name__}.{SECTIONS[label]}")
+    imported = time.perf_counter()
+    module.render(genome_reader, genome_record)
+    done = time.perf_counter()
+    timings = st.session_state.setdefault("section_timings", {})
+    entry = timings.setdefault(label, {"runs": 0, "total": 0.0, "import": 0.0})
+    entry["runs"] += 1
+    entry["last"] = done - imported
+    entry["total"] += done - imported
+    entry["import"] = max(entry["import"], imported - start)
+
+
+def timing_report():
+    # Markdown table of the recorded timings (kept out of pandas so the light sections stay light)
+    lines = ["| Section | Reruns | Last ms | Mean ms | Import ms |", "|---|---:|---:|---:|---:|"]
+    for label, t in st.session_state.get("section_timings", {}).items():
+        lines.append(f"| {label} | {t['runs']} | {t['last'] * 1000:.1f} | {t['total'] / t['runs'] * 1000:.1f} | "
+                     f"{t['import'] * 1000:.1f} |")
+    return "\n".join(lines)
@@ -0,0 +1,28 @@
+import streamlit as st
+
+
+def render(genome_reader, genome_record):
+    st.header("ℹ️ About the Human Genome Project")
+    st.markdown("""
+    **Timeline:**  
+    - 1990: Project launched.  
+    - 1995: Bacterial genome sequenced.  
+    - 2000: First draft of human genome completed.  
+    - 2003: Final human genome published.
+
+    **Collaborators:**  
+    - USA, UK, Japan, France, Germany, China, and more.  
+    - Organizations: NIH, Wellcome Trust, DOE, universities worldwide.
+
+    **Applications:**  
+    - Personalized medicine
+    - Ancestry testing
+    - Disease research
+
+    **Ethical Considerations:**  
+    - Privacy of genetic data
+    - Genetic discrimination
+
+    **Educational Goal:**  
+    To make genetics approachable and fun, demonstrating how the HGP unlocked new knowledge about DNA, traits, and health.
+    """)
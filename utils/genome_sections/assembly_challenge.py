@@ -0,0 +1,153 @@
+import time
+import streamlit as st
+from utils.assembly import (DEFAULT_MIN_OVERLAP, EXACT_ASSEMBLY_LIMIT, SEED_LEN, assemble_fragments, auto_assemble,
+                            check_assembly, contig_n50, debruijn_assemble, random_reference, simulate_read_batches)
+from utils.dna import abbreviate_sequence
+
+FULL_SEQUENCE = "CGATTATGCGGTAC"
+FRAGMENTS = ["CGATT", "ATGCG", "CGGTAC", "TATGCG"]
+
+
+def render(genome_reader, genome_record):
+    st.header("🧩 Genome Assembly Challenge")
+    st.markdown("Reconstruct the original DNA sequence by correctly ordering the overlapping fragments below.")
+
+    if "assembly_order" not in st.session_state:
+        st.session_state["assembly_order"] = []
+
+    if "assembly_available" not in st.session_state:
+        st.session_state["assembly_available"] = FRAGMENTS.copy()
+
+    def reset_assembly():
+        st.session_state["assembly_order"] = []
+        st.session_state["assembly_available"] = FRAGMENTS.copy()
+
+    st.button("Reset / Shuffle", on_click=reset_assembly)
+    st.markdown("#### Your Assembled Sequence")
+    assembled = assemble_fragments(st.session_state["assembly_order"])
+    st.code(assembled if assembled else "No fragments selected.")
+
+    st.markdown("#### Available Fragments (Click to add in order)")
+
+    def add_fragment():
+        # Runs before the rerun, so the radio can be reset to the placeholder here
+        fragment_clicked = st.session_state["frag_radio"]
+        if fragment_clicked != "Select a fragment...":
+            st.session_state["assembly_order"].append(fragment_clicked)
+            st.session_state["assembly_available"].remove(fragment_clicked)
+            st.session_state["frag_radio"] = "Select a fragment..."
+
+    options = ["Select a fragment..."] + st.session_state["assembly_available"]
+    if len(options) > 1:
+        st.radio(
+            "Select a fragment to add",
+            options,
+            key="frag_radio",
+            on_change=add_fragment,
+            label_visibility="collapsed"
+        )
+
+    if st.button("Check Assembly"):
+        if assembled == FULL_SEQUENCE:
+            st.success("Correct! Sequence assembled.")
+        else:
+            st.error("Incorrect assembly. Try again or use Reset.")
+
+    if st.button("Hint"):
+        for frag in FRAGMENTS:
+            if FULL_SEQUENCE.startswith(frag):
+                st.info(f"Try starting with: {frag}")
+                break
+
+    st.markdown("---")
+    st.subheader("🤖 Automatic Assembly")
+    st.markdown("Let the computer solve it: reads are linked through an overlap graph and merged into contigs. "
+                "Paste your own reads (one per line) to assemble a real read set.")
+    with st.form("auto_assembly_form"):
+        reads_text = st.text_area("Reads (one per line)", value="\n".join(FRAGMENTS), height=150)
+        reference_text = st.text_input("Reference sequence to check against (optional)", value=FULL_SEQUENCE)
+        min_overlap = st.number_input("Minimum overlap (bases)", min_value=SEED_LEN, max_value=200, value=DEFAULT_MIN_OVERLAP,
+                                      help=f"Used for read sets of more than {EXACT_ASSEMBLY_LIMIT} reads; smaller sets, "
+                                           "like the challenge fragments, are solved exactly with any overlap.")
+        use_uploaded_reads = genome_reader is not None and st.checkbox("Assemble the reads from the uploaded file instead", key="overlap_use_upload")
+        auto_submitted = st.form_submit_button("Auto-assemble", type="primary")
+    if auto_submitted:
+        if use_uploaded_reads:
+            reads = [record.sequence() for record in genome_reader if record.validate()[1] == 0 and len(record)]
+        else:
+            reads = [line.strip().upper() for line in reads_text.splitlines() if line.strip()]
+        if not reads:
+            st.error("Please enter at least one read.")
+        else:
+            start = time.perf_counter()
+            contigs = auto_assemble(reads, min_overlap)
+            elapsed = time.perf_counter() - start
+            col1, col2, col3 = st.columns(3)
+            with col1: st.metric("Reads", f"{len(reads):,}")
+            with col2: st.metric("Contigs", f"{len(contigs):,}")
+            with col3: st.metric("Assembly Time", f"{elapsed:.3f}s")
+            if reference_text:
+                report = check_assembly(contigs, reference_text.strip().upper())
+                if report["matches_reference"]:
+                    st.success("The assembled contig matches the reference sequence.")
+                elif report["contained_in_reference"]:
+                    st.warning(f"All contigs occur in the reference, but it is not fully reconstructed (longest contig: {report['longest_contig']:,} bases).")
+                else:
+                    st.error("The assembly does not match the reference.")
+            st.markdown("#### Contigs (longest first)")
+            st.code("\n".join(abbreviate_sequence(c) for c in contigs[:20]))
+
+    st.markdown("---")
+    st.subheader("🕸️ De Bruijn Assembly (short reads)")
+    st.markdown("Simulate high-coverage short reads from a reference, count their k-mers, drop rare k-mers as sequencing errors, "
+                "and join the rest into contigs through a De Bruijn graph.")
+    with st.form("debruijn_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            reference_source = st.radio("Reference", ["Random sequence", "Challenge sequence"] + (["Uploaded reads"] if genome_reader is not None else []), horizontal=True)
+            reference_length = st.select_slider("Random reference length", options=[10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000], value=100_000)
+            coverage = st.slider("Coverage", min_value=1, max_value=100, value=20)
+            read_length = st.slider("Read length", min_value=10, max_value=250, value=100)
+        with col2:
+            error_rate = st.slider("Error rate", min_value=0.0, max_value=0.05, value=0.001, step=0.001, format="%.3f")
+            kmer_size = st.slider("k", min_value=3, max_value=31, value=31)
+            min_count = st.slider("Minimum k-mer count", min_value=1, max_value=10, value=2)
+        debruijn_submitted = st.form_submit_button("Simulate & Assemble", type="primary")
+    if debruijn_submitted:
+        if reference_source == "Uploaded reads":
+            # Coverage, read length and error rate come from the file itself; there is no reference to check against
+            reference = None
+            read_batches = genome_reader.iter_code_batches()
+            k = kmer_size
+        else:
+            reference = FULL_SEQUENCE if reference_source == "Challenge sequence" else random_reference(reference_length)
+            read_batches = simulate_read_batches(reference, coverage, read_length, error_rate)
+            k = min(kmer_size, read_length, len(reference))
+            if k < kmer_size:
+                st.info(f"k reduced to {k} to fit the read and reference length.")
+        read_bases = 0
+
+        def counted(batches):
+            nonlocal read_bases
+            for batch in batches:
+                read_bases += batch.size
+                yield batch
+
+        with st.spinner("Assembling..."):
+            start = time.perf_counter()
+            contigs, counter = debruijn_assemble(counted(read_batches), k, min_count)
+            elapsed = time.perf_counter() - start
+        report = check_assembly(contigs, reference or "")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1: st.metric("Assembly Time", f"{elapsed:.2f}s", f"{read_bases / max(elapsed, 1e-9) / 1e6:.1f} Mbases/s", delta_color="off")
+        with col2: st.metric("Distinct k-mers", f"{counter.size:,}", f"{counter.nbytes / 1e6:.1f} MB table", delta_color="off")
+        with col3: st.metric("Contigs", f"{report['contigs']:,}")
+        with col4: st.metric("N50", f"{contig_n50(contigs):,}")
+        if reference is not None:
+            if report["matches_reference"]:
+                st.success("The reference was reconstructed as a single contig.")
+            elif report["contained_in_reference"]:
+                st.warning(f"All contigs occur in the reference; the longest covers {report['longest_contig']:,} of {len(reference):,} bases.")
+            else:
+                st.error("Some contigs do not occur in the reference (error k-mers survived the count filter).")
+        st.code("\n".join(abbreviate_sequence(c) for c in contigs[:20]) or "No contigs.")
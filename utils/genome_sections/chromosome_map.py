@@ -0,0 +1,29 @@
+import streamlit as st
+
+CHROMOSOMES = {
+    "Chromosome 11": [
+        {"gene": "HBB", "function": "Hemoglobin beta (Sickle cell anemia)"},
+        {"gene": "INS", "function": "Insulin (blood sugar regulation)"}
+    ],
+    "Chromosome 15": [
+        {"gene": "OCA2", "function": "Eye color"},
+        {"gene": "FBN1", "function": "Connective tissue (Marfan syndrome)"}
+    ],
+    "Chromosome 19": [
+        {"gene": "APOE", "function": "Alzheimer’s risk"},
+        {"gene": "LDLR", "function": "Cholesterol metabolism"}
+    ],
+    "Chromosome X": [
+        {"gene": "DMD", "function": "Dystrophin (muscular dystrophy)"},
+        {"gene": "FMR1", "function": "Fragile X syndrome"}
+    ]
+}
+
+
+def render(genome_reader, genome_record):
+    st.header("🗺️ Chromosome Map (Simplified)")
+    st.markdown("Click a chromosome to see example genes and their functions.")
+    chromo = st.selectbox("Select Chromosome", list(CHROMOSOMES.keys()))
+    st.markdown(f"### Genes on {chromo}:")
+    for g in CHROMOSOMES[chromo]:
+        st.markdown(f"- **{g['gene']}**: {g['function']}")
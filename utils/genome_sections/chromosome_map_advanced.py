@@ -0,0 +1,99 @@
+import streamlit as st
+
+CHROMOSOMES = {
+    "Chromosome 1 (~2,000 Genes)": {
+        "summary": "Largest human chromosome. Contains many important genes related to development and disease.",
+        "genes": [
+            {"name": "MTHFR", "desc": "Methylenetetrahydrofolate reductase (folate metabolism)", "locus": "1p36.22"},
+            {"name": "F5", "desc": "Coagulation factor V (blood clotting)", "locus": "1q23"}
+        ]
+    },
+    "Chromosome 4 (~750 Genes)": {
+        "summary": "Contains genes involved in skeletal development and immunity.",
+        "genes": [
+            {"name": "FGFR3", "desc": "Fibroblast growth factor receptor 3 (bone growth)", "locus": "4p16.3"}
+        ]
+    },
+    "Chromosome 6 (~1,000 Genes)": {
+        "summary": "Important for immune system function (HLA region).",
+        "genes": [
+            {"name": "HLA-A", "desc": "Major histocompatibility complex, class I, A", "locus": "6p21.3"}
+        ]
+    },
+    "Chromosome 7 (~1,150 Genes)": {
+        "summary": "One of the 23 pairs of chromosomes in humans. It spans about 159 million base pairs and represents over 5% of the total DNA in cells.",
+        "genes": [
+            {"name": "CFTR", "desc": "Provides instructions for making a protein called the cystic fibrosis transmembrane conductance regulator. Mutations in this gene cause Cystic Fibrosis.", "locus": "7q31.2"},
+            {"name": "EGFR", "desc": "Epidermal growth factor receptor, a gene that can turn into an oncogene when mutated, and is associated with multiple cancers.", "locus": "7p12"}
+        ]
+    },
+    "Chromosome 11 (~1,300 Genes)": {
+        "summary": "Contains genes involved in hemoglobin and insulin production.",
+        "genes": [
+            {"name": "HBB", "desc": "Hemoglobin beta (Sickle cell anemia)", "locus": "11p15.4"},
+            {"name": "INS", "desc": "Insulin (blood sugar regulation)", "locus": "11p15.5"}
+        ]
+    },
+    "Chromosome 12 (~1,050 Genes)": {
+        "summary": "Genes related to metabolism and immunity.",
+        "genes": [
+            {"name": "VDR", "desc": "Vitamin D receptor", "locus": "12q13.11"}
+        ]
+    },
+    "Chromosome 15 (~600 Genes)": {
+        "summary": "Genes controlling eye color, connective tissue.",
+        "genes": [
+            {"name": "OCA2", "desc": "Eye color", "locus": "15q12"},
+            {"name": "FBN1", "desc": "Connective tissue (Marfan syndrome)", "locus": "15q21.1"}
+        ]
+    },
+    "Chromosome 17 (~1,200 Genes)": {
+        "summary": "Genes related to cancer and neurological disorders.",
+        "genes": [
+            {"name": "TP53", "desc": "Tumor protein p53", "locus": "17p13.1"}
+        ]
+    },
+    "Chromosome 19 (~1,500 Genes)": {
+        "summary": "Genes involved in cholesterol metabolism and Alzheimer’s risk.",
+        "genes": [
+            {"name": "APOE", "desc": "Alzheimer’s risk", "locus": "19q13.32"},
+            {"name": "LDLR", "desc": "Cholesterol metabolism", "locus": "19p13.2"}
+        ]
+    },
+    "Chromosome 21 (~200-300 Genes)": {
+        "summary": "Smallest autosome, contains genes related to Down syndrome.",
+        "genes": [
+            {"name": "APP", "desc": "Amyloid precursor protein", "locus": "21q21.3"}
+        ]
+    },
+    "Chromosome 22 (~500 Genes)": {
+        "summary": "Genes linked to immune system and growth.",
+        "genes": [
+            {"name": "COMT", "desc": "Catechol-O-methyltransferase (dopamine metabolism)", "locus": "22q11.21"}
+        ]
+    }
+}
+
+
+def render(genome_reader, genome_record):
+    st.header("🗺️ Simplified Chromosome Map")
+    st.markdown("An interactive map of selected human chromosomes. Select a chromosome to discover key genes and their functions.")
+
+    chromo_choice = st.selectbox("Select Chromosome", list(CHROMOSOMES.keys()))
+    chromo_info = CHROMOSOMES[chromo_choice]
+    st.markdown(f'''
+        <div class="chromosome-info-box">
+            <b>{chromo_choice.split("(")[0].strip()}</b>
+            <div class="chromosome-desc">{chromo_info['summary']}</div>
+        </div>
+    ''', unsafe_allow_html=True)
+
+    st.subheader("Notable Genes:")
+    for gene in chromo_info["genes"]:
+        st.markdown(f'''
+            <div class="gene-card">
+                <b>{gene["name"]}</b>
+                <span class="gene-locus">{gene["locus"]}</span>
+                <div class="gene-desc">{gene["desc"]}</div>
+            </div>
+        ''', unsafe_allow_html=True)
@@ -0,0 +1,165 @@
+import os
+import time
+import threading
+import pandas as pd
+import streamlit as st
+from utils.charts import line_figure, plotly_chart
+from utils.dna import abbreviate_sequence, encode_sequence
+from utils.genetic_algorithm import ENGINES, evolve_islands, evolve_numpy, evolve_stream
+from utils.jobs import get_job_manager
+
+
+def render(genome_reader, genome_record):
+    st.header("🧬 Genetic Algorithm Explorer")
+    st.markdown("Simulate natural selection by setting parameters and evolving a population of DNA sequences towards a target.")
+
+    engine_name = st.radio("Engine", list(ENGINES.keys()), horizontal=True, key="ga_engine")
+    vectorized = engine_name != "Python (reference)"
+    use_islands = vectorized and st.checkbox("Island model (multi-core)", key="ga_islands",
+                                             help="Runs one sub-population per CPU core and migrates the best individuals between them.")
+    streaming = vectorized and not use_islands
+    use_record_target = vectorized and genome_record is not None and st.checkbox(
+        f"Use the uploaded record '{genome_record.name}' as the target", key="ga_use_record")
+
+    with st.form("ga_form"):
+        target_seq = st.text_input("Target DNA Sequence (A, T, C, G)", value="ATGC", disabled=use_record_target)
+        pop_size = st.slider("Population Size (per island)" if use_islands else "Population Size",
+                             min_value=10, max_value=10000 if vectorized else 200, value=100)
+        mutation_rate = st.slider("Mutation Rate", min_value=0.001, max_value=0.1, value=0.01, step=0.001)
+        max_gens = st.slider("Max Generations", min_value=10, max_value=10000 if vectorized else 500, value=100)
+        if use_islands:
+            cpu_count = os.cpu_count() or 1
+            n_islands = st.slider("Islands", min_value=2, max_value=max(8, 2 * cpu_count), value=max(2, min(cpu_count, 8)))
+            migration_interval = st.slider("Migration Interval (generations)", min_value=1, max_value=200, value=20)
+            compare_single = st.checkbox("Compare against a single-island run", value=True)
+        if streaming:
+            col1, col2 = st.columns(2)
+            with col1:
+                stagnation_window = st.number_input("Stop after N generations without improvement (0 = off)", min_value=0, value=0, step=10)
+            with col2:
+                time_budget = st.number_input("Time budget in seconds (0 = off)", min_value=0.0, value=0.0, step=1.0)
+        submitted = st.form_submit_button("Run Simulation", type="primary")
+    def show_ga_results(target_seq, best_seq, best_fit, gens, max_gens, stop_reason=None):
+        st.success(f"Simulation Complete. Evolved over {gens} generations.")
+        if stop_reason in ("stagnation", "time budget"):
+            st.info(f"Stopped early ({stop_reason}) after {gens} of {max_gens} generations.", icon="⏹️")
+        st.markdown("### Simulation Results")
+        st.progress(best_fit)
+        st.metric("Best Fitness Achieved", f"{best_fit*100:.2f}%")
+        st.markdown(f"**Target Sequence:** `{abbreviate_sequence(target_seq)}`")
+        st.markdown(f"**Best Evolved Sequence:** `{abbreviate_sequence(best_seq)}`")
+        if best_fit == 1.0:
+            st.info("Target sequence perfectly matched!", icon="✅")
+        else:
+            st.warning("Target sequence not fully matched.", icon="⚠️")
+
+    # Every run goes to the background job runner, so a long reference or island run does not
+    # hold the script thread. The job ID lives in session state and the URL so the page can
+    # reattach to a running job after a rerun or a browser refresh.
+    job_manager = get_job_manager()
+    if "ga_job_id" not in st.session_state:
+        st.session_state["ga_job_id"] = st.query_params.get("ga_job")
+
+    if submitted and use_record_target:
+        target_seq = genome_record.packed()
+
+    if submitted:
+        try:
+            encode_sequence(target_seq)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            previous = job_manager.get(st.session_state["ga_job_id"])
+            if previous is not None and not previous.done:
+                previous.cancel()
+            params = {"kind": "stream" if streaming else "batch", "engine": engine_name,
+                      "target_seq": abbreviate_sequence(target_seq), "max_gens": max_gens}
+            if streaming:
+                job_id = job_manager.submit(
+                    "Genetic algorithm", evolve_stream, target_seq, pop_size, mutation_rate, max_gens,
+                    stagnation_window=stagnation_window or None, time_budget=time_budget or None, params=params)
+            else:
+                islands = {"n_islands": n_islands, "migration_interval": migration_interval} if use_islands else None
+                if use_islands:
+                    params.update(islands, pop_size=pop_size, compare_single=compare_single)
+                # The engines check the job's cancel event themselves, so a started run can be stopped
+                stop_event = threading.Event()
+                job_id = job_manager.submit(
+                    "Genetic algorithm", run_ga, engine_name, target_seq, pop_size, mutation_rate, max_gens,
+                    islands=islands, compare_single=use_islands and compare_single, stop_event=stop_event,
+                    params=params, cancel_event=stop_event)
+            st.session_state["ga_job_id"] = job_id
+            st.query_params["ga_job"] = job_id
+
+    def show_island_scaling(params, timings):
+        n_islands, pop_size = params["n_islands"], params["pop_size"]
+        st.markdown("### Island Model Scaling")
+        st.caption(f"{n_islands} islands of {pop_size} individuals on {min(n_islands, os.cpu_count() or 1)} worker processes, "
+                   f"migrating every {params['migration_interval']} generations.")
+        col1, col2, col3 = st.columns(3)
+        with col1: st.metric("Island Wall-Clock", f"{timings['elapsed']:.2f}s")
+        if params["compare_single"]:
+            # Compare throughput (individual-generations per second) since both runs may stop early
+            island_rate = pop_size * n_islands * timings["result"][2] / timings["elapsed"]
+            single_rate = pop_size * n_islands * timings["single_result"][2] / timings["single_elapsed"]
+            with col2: st.metric("Single-Island Wall-Clock", f"{timings['single_elapsed']:.2f}s",
+                                 f"{timings['single_result'][2]} generations", delta_color="off")
+            with col3: st.metric("Speedup", f"{island_rate / single_rate:.2f}x")
+
+    def ga_job_panel(polling):
+        job = job_manager.get(st.session_state["ga_job_id"])
+        if job is None:
+            return
+        streamed = job.params.get("kind", "stream") == "stream"
+        st.markdown("### Live Telemetry" if streamed else "### Run Status")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.caption(f"Job `{job.id}` · {job.params.get('engine', '')} · {job.status}")
+        with col2:
+            if not job.done and st.button("Cancel Run", key="ga_job_cancel", use_container_width=True):
+                job.cancel()
+        history = list(job.progress)
+        if history:
+            stats = pd.DataFrame(history).set_index("generation")
+            # Thinned to a few thousand points; the panel redraws every second
+            plotly_chart(line_figure(stats[["best_so_far", "mean_fitness", "fitness_std"]]), "GA telemetry", use_container_width=True)
+            st.caption(f"Generation {stats.index[-1]} · {stats['seconds'].iloc[-1] * 1000:.2f} ms/generation")
+        if job.status == "done":
+            if streamed:
+                best_seq, best_fit, gens, stop_reason = job.result
+            else:
+                (best_seq, best_fit, gens), stop_reason = job.result["result"], None
+            show_ga_results(job.params["target_seq"], best_seq, best_fit, gens, job.params["max_gens"], stop_reason)
+            if "n_islands" in job.params:
+                show_island_scaling(job.params, job.result)
+        elif job.status == "cancelled":
+            st.warning("Run cancelled.", icon="⏹️")
+        elif job.status == "failed":
+            st.error(f"Run failed: {job.error}")
+        elif not streamed:
+            st.info("Running genetic algorithm...", icon="⏳")
+        if polling and job.done:
+            # Rerun the whole page once so the panel is re-registered without polling
+            st.rerun()
+
+    active_job = job_manager.get(st.session_state["ga_job_id"])
+    polling = active_job is not None and not active_job.done
+    st.fragment(ga_job_panel, run_every=1.0 if polling else None)(polling)
+
+
+def run_ga(engine_name, target_seq, pop_size, mutation_rate, max_gens, islands=None, compare_single=False, stop_event=None):
+    # A non-streaming run for the job runner: the result and its wall-clock time, plus a
+    # single-island run of the same total population when comparing. Every engine stops
+    # early once stop_event is set.
+    start = time.perf_counter()
+    if islands:
+        result = evolve_islands(target_seq, pop_size, mutation_rate, max_gens, stop_event=stop_event, **islands)
+    else:
+        result = ENGINES[engine_name](target_seq, pop_size, mutation_rate, max_gens, stop_event=stop_event)
+    timings = {"result": result, "elapsed": time.perf_counter() - start}
+    if islands and compare_single and not (stop_event is not None and stop_event.is_set()):
+        start = time.perf_counter()
+        timings["single_result"] = evolve_numpy(target_seq, pop_size * islands["n_islands"], mutation_rate, max_gens,
+                                                stop_event=stop_event)
+        timings["single_elapsed"] = time.perf_counter() - start
+    return timings
@@ -0,0 +1,20 @@
+import streamlit as st
+
+
+def render(genome_reader, genome_record):
+    st.header("What is the Human Genome Project?")
+    st.markdown("""
+    The **Human Genome Project (HGP)** was an international scientific effort from **1990 to 2003** to map all 3 billion DNA base pairs in humans.  
+    Its completion revolutionized medicine, genetics, ancestry research, and disease studies.
+
+    **Key Outcomes:**
+    - Entire human DNA sequence mapped.
+    - Identified 20,000+ genes.
+    - Enabled new treatments for genetic disorders.
+    - Advanced personalized medicine and ancestry science.
+
+    **Why is it important?**
+    - Helps us understand how genes shape traits, health, and diversity.
+    - Supports research into genetic diseases.
+    - Lays the foundation for modern genetics, gene therapy, and precision healthcare.
+    """)
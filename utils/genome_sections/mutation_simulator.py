@@ -0,0 +1,111 @@
+import time
+import pandas as pd
+import streamlit as st
+from utils.jobs import get_job_manager
+from utils.mutation import apply_mutation_batch, mutate, mutation_batch_blocks, summarize_mutation_blocks
+
+
+def render(genome_reader, genome_record):
+    st.header("🧪 Mutation Simulator")
+    st.markdown("Enter a short DNA sequence (e.g., `ATCGGA`). The simulator will apply a random mutation.")
+    dna_input = st.text_input("DNA Sequence (A, T, C, G only)", "")
+    if st.button("Simulate Mutation"):
+        mutated, explanation = mutate(dna_input)
+        if mutated and explanation:
+            st.markdown(f"**Original DNA:** `{dna_input}`")
+            st.markdown(f"**Mutation Type:** {explanation}")
+            st.markdown(f"**Mutated DNA:** `{mutated}`")
+            if "deletion" in explanation or "substitution" in explanation:
+                st.info("Example: A substitution mutation in the **HBB** gene (chromosome 11) can cause Sickle Cell Anemia by changing one amino acid in hemoglobin.")
+        else:
+            st.error(mutated)
+
+    # Batch runs go to the background job runner; the panel polls the job until it is done
+    job_manager = get_job_manager()
+    with st.expander("🎲 Batch Monte Carlo mode"):
+        st.markdown("Apply many random mutations to many copies of a sequence at once and look at the distribution of outcomes.")
+        with st.form("mutation_batch_form"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                n_replicates = st.number_input("Replicate sequences (N)", min_value=1, max_value=100_000, value=1000, step=100)
+            with col2:
+                n_mutations = st.number_input("Mutations per sequence (M)", min_value=1, max_value=10_000, value=100, step=10)
+            with col3:
+                batch_length = st.number_input("Sequence length (used when no DNA is entered above)", min_value=1, max_value=1_000_000, value=10_000, step=1000)
+            use_record_batch = genome_record is not None and st.checkbox(f"Use the uploaded record '{genome_record.name}'", key="mutation_use_record")
+            batch_submitted = st.form_submit_button("Run Batch", type="primary")
+        if batch_submitted:
+            seq = dna_input.strip().upper()
+            if use_record_batch:
+                seq = genome_record.sequence() if len(genome_record) <= 1000 else ""
+            if seq and any(c not in "ATCG" for c in seq):
+                st.error("Invalid sequence. Only letters A, T, C, G allowed.")
+            else:
+                seq_length = len(genome_record) if use_record_batch else len(seq) if seq else batch_length
+                previous = job_manager.get(st.session_state.get("mutation_batch_job_id"))
+                if previous is not None and not previous.done:
+                    previous.cancel()
+                st.session_state["mutation_batch_job_id"] = job_manager.submit(
+                    "Mutation batch", run_mutation_batch, seq, seq_length, n_replicates, n_mutations,
+                    params={"seq_length": seq_length, "n_replicates": n_replicates, "n_mutations": n_mutations})
+
+        def batch_panel(polling):
+            job = job_manager.get(st.session_state.get("mutation_batch_job_id"))
+            if job is None:
+                return
+            if not job.done:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    done = job.progress[-1] if job.progress else 0
+                    st.progress(done / job.params["n_replicates"],
+                                text=f"Simulated {done:,} of {job.params['n_replicates']:,} replicates "
+                                     f"({job.params['n_mutations']:,} mutations each)")
+                with col2:
+                    if st.button("Cancel", key="mutation_batch_cancel", use_container_width=True):
+                        job.cancel()
+            elif job.status == "done":
+                show_batch_results(job.params, job.result)
+            elif job.status == "cancelled":
+                st.warning("Batch cancelled.", icon="⏹️")
+            elif job.status == "failed":
+                st.error(f"Batch failed: {job.error}")
+            if polling and job.done:
+                st.rerun()
+
+        job = job_manager.get(st.session_state.get("mutation_batch_job_id"))
+        polling = job is not None and not job.done
+        st.fragment(batch_panel, run_every=0.5 if polling else None)(polling)
+
+
+def run_mutation_batch(seq, seq_length, n_replicates, n_mutations):
+    # The batch job: replicates are simulated block by block (reporting progress and checking for
+    # cancellation in between), and only the summary and a preview are kept as the job result
+    start = time.perf_counter()
+    summary = yield from summarize_mutation_blocks(mutation_batch_blocks(seq_length, n_replicates, n_mutations),
+                                                   seq_length, n_mutations)
+    summary["elapsed"] = time.perf_counter() - start
+    first = summary.pop("first")
+    if seq and len(seq) + n_mutations <= 1000:
+        summary["preview"] = apply_mutation_batch(seq, first)
+    return summary
+
+
+def show_batch_results(params, summary):
+    seq_length, n_mutations = params["seq_length"], params["n_mutations"]
+    col1, col2, col3 = st.columns(3)
+    with col1: st.metric("Mutations Simulated", f"{params['n_replicates'] * n_mutations:,}")
+    with col2: st.metric("Mean Final Length", f"{summary['mean_length']:,.1f}", f"{summary['mean_length'] - seq_length:+.1f}")
+    with col3: st.metric("Time", f"{summary['elapsed'] * 1000:.0f} ms")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Mutation types**")
+        st.bar_chart(pd.Series(summary["type_counts"], name="Count"))
+    with col2:
+        st.markdown("**Final sequence lengths**")
+        lengths, counts = summary["final_lengths"]
+        st.bar_chart(pd.DataFrame({"Length": lengths, "Replicates": counts}).set_index("Length"))
+    st.markdown("**Mutation positions**")
+    bin_starts, hist = summary["position_histogram"]
+    st.bar_chart(pd.DataFrame({"Position": bin_starts.astype(int), "Mutations": hist}).set_index("Position"))
+    if "preview" in summary:
+        st.markdown(f"**Replicate 1 after {n_mutations} mutations:** `{summary['preview']}`")
@@ -0,0 +1,38 @@
+import streamlit as st
+
+TRAITS = {
+    "Eye Color": {
+        "Brown": {"type": "Dominant", "gene": "OCA2", "chromosome": 15, "explanation": "Brown eyes are dominant. The OCA2 gene on chromosome 15 controls melanin production in the iris."},
+        "Blue": {"type": "Recessive", "gene": "OCA2 (variant)", "chromosome": 15, "explanation": "Blue eyes are recessive. They result from a variant in the OCA2 gene decreasing melanin in the iris."},
+        "Black": {"type": "Dominant", "gene": "OCA2", "chromosome": 15, "explanation": "Black eyes are dominant. OCA2 gene controls this pigment."}
+    },
+    "Blood Type": {
+        "Type A": {"type": "Dominant", "gene": "ABO", "chromosome": 9, "explanation": "A blood type is dominant over O. The ABO gene on chromosome 9 determines blood group."},
+        "Type O": {"type": "Recessive", "gene": "ABO", "chromosome": 9, "explanation": "O blood type is recessive. Both copies must be O alleles."},
+        "Type B": {"type": "Dominant", "gene": "ABO", "chromosome": 9, "explanation": "B blood type is dominant over O. The ABO gene determines this."}
+    },
+    "Lactose Tolerance": {
+        "Tolerant": {"type": "Dominant", "gene": "LCT", "chromosome": 2, "explanation": "Lactose tolerance is dominant. Controlled by LCT gene on chromosome 2."},
+        "Intolerant": {"type": "Recessive", "gene": "LCT", "chromosome": 2, "explanation": "Lactose intolerance is recessive. Both copies must have the variant."}
+    },
+    "Dimples": {
+        "Yes": {"type": "Dominant", "gene": "Unknown", "chromosome": "-", "explanation": "Dimples are usually dominant, but the gene is not fully characterized."},
+        "No": {"type": "Recessive", "gene": "Unknown", "chromosome": "-", "explanation": "No dimples is recessive."}
+    }
+}
+
+
+def render(genome_reader, genome_record):
+    st.header("🧬 Trait Analyzer: Dominant vs Recessive")
+    st.markdown("Select a trait to learn if it is **dominant or recessive**, and which gene controls it.")
+    trait = st.selectbox("Choose a trait", list(TRAITS.keys()))
+    value = st.selectbox("Select trait value", list(TRAITS[trait].keys()))
+    info = TRAITS[trait][value]
+    st.markdown(f"""
+        **Trait:** {trait}  
+        **Value:** {value}  
+        **Inheritance:** `{info['type']}`  
+        **Gene:** `{info['gene']}`  
+        **Chromosome:** `{info['chromosome']}`  
+        **Explanation:** {info['explanation']}
+    """)
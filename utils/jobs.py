@@ -0,0 +1,116 @@
+import os
+import time
+import uuid
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, name, params, cancel_event=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.params = params
+        self.status = QUEUED
+        self.progress = []
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.future = None
+        self._cancel_event = cancel_event or threading.Event()
+
+    @property
+    def done(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self._finish(CANCELLED)
+
+    def _finish(self, status):
+        self.status = status
+        self.finished = time.time()
+
+
+class JobManager:
+    # Runs jobs on a shared thread pool so they outlive the script run that submitted them.
+    # Generator functions report each yielded value as progress and are checked for
+    # cancellation between yields; their return value becomes the job result. Other functions
+    # can be stopped by passing cancel_event and having the function check the same event.
+    def __init__(self, max_workers=None, keep_finished=50):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.keep_finished = keep_finished
+
+    def submit(self, name, fn, *args, params=None, cancel_event=None, **kwargs):
+        job = Job(name, params or {}, cancel_event)
+        with self._lock:
+            self._evict_finished()
+            self._jobs[job.id] = job
+        job.future = self._pool.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def get(self, job_id):
+        return self._jobs.get(job_id) if job_id else None
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _evict_finished(self):
+        finished = sorted((j for j in self._jobs.values() if j.done), key=lambda j: j.finished)
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job.id]
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            job._finish(CANCELLED)
+            return
+        job.status = RUNNING
+        try:
+            if inspect.isgeneratorfunction(fn):
+                stream = fn(*args, **kwargs)
+                while True:
+                    if job.cancel_requested:
+                        stream.close()
+                        raise JobCancelled()
+                    try:
+                        job.progress.append(next(stream))
+                    except StopIteration as done:
+                        job.result = done.value
+                        break
+            else:
+                job.result = fn(*args, **kwargs)
+                if job.cancel_requested:
+                    raise JobCancelled()
+            job._finish(DONE)
+        except JobCancelled:
+            job._finish(CANCELLED)
+        except Exception as e:
+            job.error = e
+            job._finish(FAILED)
+
+
+@st.cache_resource
+def get_job_manager():
+    # One manager per server process, shared by every session and rerun
+    return JobManager()
@@ -0,0 +1,441 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.dataset_cache import USER_CACHE_ROOT, private_dir
+from utils.trait_index import MAX_AGE
+
+# scikit-learn (which pulls in SciPy) and joblib are imported inside the functions that use
+# them, so a page can render before they load
+
+TARGET = "Handedness"
+MIN_TRAINING_ROWS = 11
+DEFAULT_PARAMS = {"max_depth": 4, "min_samples_leaf": 1, "test_size": 0.3, "random_state": 42}
+# Saved models are loaded with joblib (pickle), which runs code from the file, so they are kept
+# in a private per-user directory rather than the shared temp directory
+MODEL_DIR = os.environ.get("MODEL_CACHE_DIR", os.path.join(USER_CACHE_ROOT, "models"))
+MEMORY_BUDGET = int(os.environ.get("MODEL_MEMORY_BUDGET_MB", 256)) * 1024 * 1024
+DISK_BUDGET = int(os.environ.get("MODEL_DISK_BUDGET_MB", 512)) * 1024 * 1024
+SCORE_CHUNK_ROWS = STREAM_CHUNK_ROWS = 250_000
+# Cross-validation folds and grid points are fitted in parallel on this many threads
+# (-1: one per core)
+N_JOBS = int(os.environ.get("MODEL_N_JOBS", -1))
+TUNE_GRID = {"max_depth": [2, 3, 4, 6, 8, 12], "min_samples_leaf": [1, 5, 20, 50], "class_weight": [None, "balanced"]}
+SCORERS = ["accuracy", "balanced_accuracy"]
+STREAM_PARAMS = {"alpha": 1.0, "holdout": 0.1, "chunk_rows": 250_000, "random_state": 42}
+# Held-out rows kept for scoring the final streaming model; the rest are only scored once
+MAX_HOLDOUT_ROWS = 200_000
+# Bump when the bundle layout or the training code changes, so old files are not loaded
+MODEL_VERSION = 2
+
+
+def encode_column(column):
+    # LabelEncoder fitted on the column's values; categorical columns are encoded from their
+    # codes instead of comparing every string
+    from sklearn.preprocessing import LabelEncoder
+    encoder = LabelEncoder()
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = column.cat.categories
+        encoder.fit(categories)
+        lookup = np.searchsorted(encoder.classes_, categories)
+        return encoder, lookup[column.cat.codes.to_numpy()]
+    return encoder, encoder.fit_transform(column)
+
+
+def encode_frame(df):
+    # The features and target as integers, with one fitted encoder per non-numeric column
+    df_ml = df.drop(columns=['S.No', 'Name'])
+    encoders = {}
+    for column in df_ml.select_dtypes(exclude='number').columns:
+        encoders[column], df_ml[column] = encode_column(df_ml[column])
+    return df_ml.drop(TARGET, axis=1), df_ml[TARGET], encoders
+
+
+def train_trait_model(df, params):
+    from sklearn.metrics import accuracy_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.tree import DecisionTreeClassifier
+    start = time.perf_counter()
+    X, y, encoders = encode_frame(df)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=params["test_size"], random_state=params["random_state"])
+    model = DecisionTreeClassifier(max_depth=params["max_depth"], min_samples_leaf=params["min_samples_leaf"],
+                                   class_weight=params.get("class_weight"), random_state=params["random_state"])
+    model.fit(X_train, y_train)
+    bundle = {
+        "model": model,
+        "encoders": encoders,
+        "feature_names": X.columns.tolist(),
+        "accuracy": accuracy_score(y_test, model.predict(X_test)),
+        "params": dict(params),
+        "rows": len(df),
+        "train_seconds": time.perf_counter() - start,
+    }
+    bundle["nbytes"] = len(pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL))
+    return bundle
+
+
+# --- Hyperparameter search ---
+
+def _fit_fold(X, y, train, test, grid, params, fold):
+    from sklearn import metrics
+    from sklearn.tree import DecisionTreeClassifier
+    start = time.perf_counter()
+    model = DecisionTreeClassifier(**params).fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - start
+    predicted = model.predict(X[test])
+    row = {"grid": grid, **params, "fold": fold, "fit_seconds": fit_seconds}
+    for name in SCORERS:
+        row[name] = getattr(metrics, f"{name}_score")(y[test], predicted)
+    return row
+
+
+def tune_trait_model(df, search):
+    # Stratified k-fold cross-validation over every combination in search (lists of
+    # max_depth, min_samples_leaf and class_weight, plus n_splits, scoring and random_state).
+    # The best combination by mean score is refitted on all rows. Tree fitting releases the
+    # GIL, so folds run on threads and share X instead of copying it to worker processes.
+    import joblib
+    from sklearn.model_selection import StratifiedKFold
+    from sklearn.tree import DecisionTreeClassifier
+    start = time.perf_counter()
+    features, target, encoders = encode_frame(df)
+    X, y = features.to_numpy(dtype=np.float32), np.asarray(target)
+    grid = [{"max_depth": d, "min_samples_leaf": m, "class_weight": w, "random_state": search["random_state"]}
+            for d in search["max_depth"] for m in search["min_samples_leaf"] for w in search["class_weight"]]
+    # Small datasets get fewer folds: every fold needs at least one row of the largest class
+    n_splits = int(min(search["n_splits"], np.bincount(y).max()))
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=search["random_state"])
+    splits = list(folds.split(X, y))
+    rows = joblib.Parallel(n_jobs=N_JOBS, prefer="threads")(
+        joblib.delayed(_fit_fold)(X, y, train, test, i, params, fold)
+        for i, params in enumerate(grid) for fold, (train, test) in enumerate(splits))
+    cv_results = pd.DataFrame(rows).drop(columns="random_state")
+    cv_results["class_weight"] = cv_results["class_weight"].fillna("none")
+    summary = (cv_results.groupby(["grid", "max_depth", "min_samples_leaf", "class_weight"], sort=False)
+               .agg(mean_score=(search["scoring"], "mean"), std_score=(search["scoring"], "std"),
+                    accuracy=("accuracy", "mean"), fit_seconds=("fit_seconds", "mean"))
+               .reset_index().sort_values("mean_score", ascending=False, kind="stable", ignore_index=True))
+    best = grid[summary.loc[0, "grid"]]
+
+    model = DecisionTreeClassifier(**best).fit(features, target)
+    bundle = {
+        "model": model,
+        "encoders": encoders,
+        "feature_names": features.columns.tolist(),
+        "accuracy": float(summary.loc[0, "accuracy"]),
+        "params": dict(best),
+        "rows": len(df),
+        "train_seconds": time.perf_counter() - start,
+        "search": {**search, "n_splits": n_splits},
+        "cv_results": cv_results,
+        "cv_summary": summary,
+    }
+    bundle["nbytes"] = len(pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL))
+    return bundle
+
+
+def encode_input(bundle, values):
+    # One row of raw trait values -> the model's feature frame
+    encoders = bundle["encoders"]
+    for name, size in bundle.get("category_sizes", {}).items():
+        if not (0 <= values[name] < size and values[name] == int(values[name])):
+            raise ValueError(f"Error: {name} must be a whole number from 0 to {size - 1} for this model.")
+    return pd.DataFrame({name: [encoders[name].transform([values[name]])[0] if name in encoders else values[name]]
+                         for name in bundle["feature_names"]})
+
+
+def predict(bundle, values):
+    encoded = bundle["model"].predict(encode_input(bundle, values))[0]
+    return bundle["encoders"][TARGET].inverse_transform([encoded])[0]
+
+
+# --- Batch scoring ---
+
+def _encode_chunk(bundle, chunk):
+    # Feature matrix for a chunk of raw rows plus a mask of the rows that could be encoded
+    # (known trait values and a numeric Age). Numeric features listed in category_sizes are
+    # categories to the model, so only whole values from 0 to size - 1 are valid.
+    X = np.empty((len(chunk), len(bundle["feature_names"])), dtype=np.float32)
+    valid = np.ones(len(chunk), dtype=bool)
+    sizes = bundle.get("category_sizes", {})
+    for i, name in enumerate(bundle["feature_names"]):
+        column = chunk[name]
+        if name in bundle["encoders"]:
+            classes = bundle["encoders"][name].classes_
+            categories = column.cat.categories.to_numpy()
+            pos = np.minimum(np.searchsorted(classes, categories), len(classes) - 1)
+            lookup = np.where(classes[pos] == categories, pos, -1)
+            codes = column.cat.codes.to_numpy()
+            encoded = np.where(codes >= 0, lookup[codes], -1)
+            valid &= encoded >= 0
+        else:
+            encoded = pd.to_numeric(column, errors="coerce").to_numpy(dtype=float)
+            if name in sizes:
+                valid &= (encoded >= 0) & (encoded < sizes[name]) & (encoded == np.round(encoded))
+            else:
+                valid &= ~np.isnan(encoded)
+        X[:, i] = encoded
+    return X, valid
+
+
+def score_chunks(bundle, source, chunksize=SCORE_CHUNK_ROWS):
+    # Yields the rows of a CSV with the predicted class and one probability column per class
+    # added. Rows with unknown or missing values get an empty prediction.
+    features = bundle["feature_names"]
+    if hasattr(source, "seek"):
+        source.seek(0)
+    missing = set(features).difference(pd.read_csv(source, nrows=0).columns)
+    if missing:
+        raise ValueError(f"Error: The CSV to score must contain these columns: {', '.join(features)} "
+                         f"(missing: {', '.join(sorted(missing))})")
+    if hasattr(source, "seek"):
+        source.seek(0)
+    model = bundle["model"]
+    class_names = bundle["encoders"][TARGET].classes_[model.classes_]
+    # Everything else is passed through as text, so every chunk has the same columns and types
+    dtype = defaultdict(lambda: str, {name: "category" for name in features if name in bundle["encoders"]})
+    # index_col=False: a trailing comma on every row must not shift the columns
+    for chunk in pd.read_csv(source, dtype=dtype, chunksize=chunksize, index_col=False):
+        X, valid = _encode_chunk(bundle, chunk)
+        proba = np.full((len(chunk), len(class_names)), np.nan)
+        if valid.any():
+            proba[valid] = model.predict_proba(pd.DataFrame(X[valid], columns=features))
+        predicted = np.where(valid, class_names[np.nan_to_num(proba, nan=0).argmax(axis=1)], "")
+        chunk = chunk.drop(columns=[TARGET], errors="ignore")
+        chunk[f"Predicted {TARGET}"] = predicted
+        for k, name in enumerate(class_names):
+            chunk[f"P({name})"] = proba[:, k].round(4)
+        yield chunk
+
+
+def score_csv(bundle, source, out_path, chunksize=SCORE_CHUNK_ROWS):
+    # Writes the scored rows to out_path chunk by chunk; yields the running row count.
+    # Arrow's CSV writer is several times faster than DataFrame.to_csv here.
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    rows = 0
+    writer = None
+    try:
+        for chunk in score_chunks(bundle, source, chunksize):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            table = table.cast(pa.schema([pa.field(f.name, pa.string() if pa.types.is_dictionary(f.type) else f.type)
+                                          for f in table.schema]))
+            if writer is None:
+                writer = pacsv.CSVWriter(out_path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+            yield rows
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# --- Streaming training ---
+
+def _trait_chunks(source, chunksize, skip=("S.No", "Name")):
+    # Slices of a DataFrame or chunks of a CSV without the skip columns, with every column
+    # except Age as a categorical
+    if isinstance(source, pd.DataFrame):
+        source = source.drop(columns=list(skip), errors="ignore")
+        chunks = (source.iloc[start:start + chunksize] for start in range(0, len(source), chunksize))
+    else:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        chunks = pd.read_csv(source, chunksize=chunksize, usecols=lambda c: c not in skip, index_col=False,
+                             dtype=defaultdict(lambda: "category", {"Age": str}))
+    for chunk in chunks:
+        columns = [c for c in chunk.columns if c != "Age" and not isinstance(chunk[c].dtype, pd.CategoricalDtype)]
+        yield chunk.astype({c: "category" for c in columns}) if columns else chunk
+
+
+def scan_vocabulary(source, chunksize=STREAM_CHUNK_ROWS):
+    # Sorted values of every trait column. Categorical DataFrame columns are read from their
+    # dtype; anything else takes one pass over the data.
+    skip = ("S.No", "Name", "Age")
+    if isinstance(source, pd.DataFrame) and all(isinstance(source[c].dtype, pd.CategoricalDtype)
+                                                for c in source.columns.drop(list(skip), errors="ignore")):
+        chunks = [source.drop(columns=list(skip), errors="ignore").head(0)]
+    else:
+        chunks = _trait_chunks(source, chunksize, skip)
+    vocabulary = {}
+    for chunk in chunks:
+        for column in chunk.columns:
+            vocabulary.setdefault(column, set()).update(chunk[column].cat.categories)
+    return {column: sorted(values) for column, values in vocabulary.items()}
+
+
+def _fixed_encoder(values):
+    from sklearn.preprocessing import LabelEncoder
+    encoder = LabelEncoder()
+    encoder.classes_ = np.array(values, dtype=object)
+    return encoder
+
+
+def train_streaming_model(source, params, chunksize=None):
+    # Trains a categorical naive Bayes model chunk by chunk (partial_fit), so memory depends on
+    # the chunk size and not on the number of rows. The vocabulary is fixed before the first
+    # chunk and Age is a category from 0 to MAX_AGE. A random params["holdout"] share of rows
+    # is never trained on: each held-out chunk is scored by the model trained on the rows
+    # before it (the "stream" curve), and up to MAX_HOLDOUT_ROWS of them are kept to score
+    # the final model.
+    from sklearn.metrics import accuracy_score
+    from sklearn.naive_bayes import CategoricalNB
+    start = time.perf_counter()
+    chunksize = chunksize or params["chunk_rows"]
+    vocabulary = scan_vocabulary(source, chunksize)
+    if TARGET not in vocabulary:
+        raise ValueError(f"Error: The training data must contain a {TARGET} column.")
+    encoders = {column: _fixed_encoder(values) for column, values in vocabulary.items()}
+    features = ["Age"] + [column for column in vocabulary if column != TARGET]
+    category_sizes = {"Age": MAX_AGE + 1}
+    spec = {"feature_names": features + [TARGET], "encoders": encoders, "category_sizes": category_sizes}
+    model = CategoricalNB(alpha=params["alpha"],
+                          min_categories=[MAX_AGE + 1] + [len(vocabulary[column]) for column in features[1:]])
+    classes = np.arange(len(vocabulary[TARGET]))
+    rng = np.random.default_rng(params["random_state"])
+    holdout_X, holdout_y, stream = [], [], []
+    rows = tested = correct = 0
+
+    for chunk in _trait_chunks(source, chunksize):
+        chunk_start = time.perf_counter()
+        if "Age" not in chunk.columns:
+            raise ValueError("Error: The training data must contain an Age column.")
+        X, valid = _encode_chunk(spec, chunk)
+        X, y = X[valid, :-1].astype(np.int16), X[valid, -1].astype(np.int16)
+        held = rng.random(len(y)) < params["holdout"]
+        if stream and held.any():
+            tested += int(held.sum())
+            correct += int((model.predict(pd.DataFrame(X[held], columns=features)) == y[held]).sum())
+        room = MAX_HOLDOUT_ROWS - sum(len(h) for h in holdout_y)
+        if room > 0:
+            holdout_X.append(X[held][:room])
+            holdout_y.append(y[held][:room])
+        if (~held).any():
+            model.partial_fit(pd.DataFrame(X[~held], columns=features), y[~held], classes=classes)
+        rows += len(chunk)
+        stream.append({"rows": rows, "holdout_accuracy": correct / tested if tested else np.nan,
+                       "chunk_seconds": time.perf_counter() - chunk_start})
+    if not hasattr(model, "class_count_"):
+        raise ValueError("Error: No complete rows to train on.")
+
+    holdout_X, holdout_y = np.concatenate(holdout_X), np.concatenate(holdout_y)
+    accuracy = (accuracy_score(holdout_y, model.predict(pd.DataFrame(holdout_X, columns=features)))
+                if len(holdout_y) else np.nan)
+    bundle = {
+        "model": model,
+        "encoders": encoders,
+        "feature_names": features,
+        "category_sizes": category_sizes,
+        "accuracy": float(accuracy),
+        "params": dict(params),
+        "rows": rows,
+        "train_seconds": time.perf_counter() - start,
+        "stream": pd.DataFrame(stream),
+        "holdout_rows": len(holdout_y),
+    }
+    bundle["nbytes"] = len(pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL))
+    return bundle
+
+
+class ModelRegistry:
+    # Fitted models keyed by dataset hash and hyperparameters. Models are kept in memory
+    # (least recently used first out once over memory_budget) and saved with joblib so a
+    # restart or another server process can load them instead of training again.
+    def __init__(self, model_dir=MODEL_DIR, memory_budget=MEMORY_BUDGET, disk_budget=DISK_BUDGET):
+        self.model_dir = model_dir
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_ok = None
+        self.hits = {"memory": 0, "disk": 0, "trained": 0}
+
+    @staticmethod
+    def key(dataset_hash, params):
+        text = json.dumps({"data": dataset_hash, "params": params, "version": MODEL_VERSION}, sort_keys=True)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.model_dir, f"{key}.joblib")
+
+    def _disk_usable(self):
+        # Any file in model_dir would be unpickled, so it is only used while it is private
+        if self._disk_ok is None:
+            self._disk_ok = private_dir(self.model_dir)
+        return self._disk_ok
+
+    def get(self, dataset_hash, df, params, train=train_trait_model):
+        # Returns (bundle, source) where source is "memory", "disk" or "trained". train is
+        # called as train(df, params) on a miss, so params must identify what it builds.
+        import joblib
+        key = self.key(dataset_hash, params)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits["memory"] += 1
+                return self._models[key], "memory"
+        try:
+            if not self._disk_usable():
+                raise FileNotFoundError(self.model_dir)
+            bundle = joblib.load(self._path(key))
+            os.utime(self._path(key))
+            source = "disk"
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            bundle = train(df, params)
+            self._save(key, bundle)
+            source = "trained"
+        with self._lock:
+            self.hits[source] += 1
+            self._models[key] = bundle
+            self._evict_memory()
+        return bundle, source
+
+    def _save(self, key, bundle):
+        import joblib
+        if not self._disk_usable():
+            return
+        try:
+            tmp = self._path(key) + ".tmp"
+            joblib.dump(bundle, tmp)
+            os.replace(tmp, self._path(key))
+            self._evict_disk()
+        except OSError:
+            pass
+
+    def _evict_memory(self):
+        total = sum(b["nbytes"] for b in self._models.values())
+        while total > self.memory_budget and len(self._models) > 1:
+            _, bundle = self._models.popitem(last=False)
+            total -= bundle["nbytes"]
+
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.model_dir):
+            if name.endswith(".joblib"):
+                path = os.path.join(self.model_dir, name)
+                files.append((os.path.getmtime(path), os.path.getsize(path), path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files)[:-1]:
+            if total <= self.disk_budget:
+                break
+            os.remove(path)
+            total -= size
+
+    @property
+    def nbytes(self):
+        return sum(b["nbytes"] for b in self._models.values())
+
+    def __len__(self):
+        return len(self._models)
+
+
+@st.cache_resource
+def get_model_registry():
+    # One registry per server process, shared by every session
+    return ModelRegistry()
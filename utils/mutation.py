@@ -0,0 +1,125 @@
+import random
+import numpy as np
+from utils.dna import PackedSequence, decode_sequence, encode_sequence
+
+
+def mutate(seq):
+    # Applies one random insertion, deletion or substitution. A PackedSequence is edited in
+    # place for substitutions; insertions and deletions return a new packed sequence.
+    if isinstance(seq, PackedSequence):
+        return _mutate_packed(seq)
+    if not seq or any(c not in "ATCG" for c in seq.upper()):
+        return ("Invalid sequence. Only letters A, T, C, G allowed.", None)
+    seq = seq.upper()
+    mutation_type = random.choice(["insertion", "deletion", "substitution"])
+    pos = random.randint(0, len(seq)-1) if seq else 0
+    if mutation_type == "insertion":
+        base = random.choice("ATCG")
+        mutated_seq = seq[:pos] + base + seq[pos:]
+        explanation = f"Insertion of {base} at position {pos+1}"
+    elif mutation_type == "deletion" and len(seq) > 1:
+        mutated_seq = seq[:pos] + seq[pos+1:]
+        explanation = f"Deletion at position {pos+1}"
+    else:  # substitution
+        base = random.choice([b for b in "ATCG" if b != seq[pos]])
+        mutated_seq = seq[:pos] + base + seq[pos+1:]
+        explanation = f"Substitution of {seq[pos]}→{base} at position {pos+1}"
+    return (mutated_seq, explanation)
+
+
+def _mutate_packed(seq):
+    if not len(seq):
+        return ("Invalid sequence. Only letters A, T, C, G allowed.", None)
+    mutation_type = random.choice(["insertion", "deletion", "substitution"])
+    pos = random.randint(0, len(seq)-1)
+    if mutation_type == "insertion":
+        base = random.choice("ATCG")
+        return (seq.insert(pos, base), f"Insertion of {base} at position {pos+1}")
+    if mutation_type == "deletion" and len(seq) > 1:
+        return (seq.delete(pos), f"Deletion at position {pos+1}")
+    old = seq[pos]
+    base = random.choice([b for b in "ATCG" if b != old])
+    seq[pos] = base
+    return (seq, f"Substitution of {old}→{base} at position {pos+1}")
+
+
+# --- Batch Monte Carlo ---
+MUTATION_TYPES = ("insertion", "deletion", "substitution")
+INSERTION, DELETION, SUBSTITUTION = range(3)
+# Replicates are simulated in blocks of at most this many mutations (about 6 bytes each)
+MAX_BLOCK_MUTATIONS = 1 << 23
+
+
+def simulate_mutation_batch(seq_length, n_replicates, n_mutations, seed=None):
+    # Draws n_mutations sequential mutations for each of n_replicates sequences of seq_length,
+    # one vectorized step per mutation across all replicates. Positions are 0-based in the
+    # sequence as it is at that step; as in mutate(), a deletion on a 1-base sequence becomes
+    # a substitution. base_draws holds the inserted base code, or the 1-3 code offset of a
+    # substitution from the base it replaces.
+    rng = np.random.default_rng(seed)
+    types = rng.integers(0, 3, size=(n_replicates, n_mutations), dtype=np.uint8)
+    # Positions are below seq_length + n_mutations, which nearly always fits in 32 bits
+    positions = np.empty((n_replicates, n_mutations), dtype=np.int32 if seq_length + n_mutations < 2**31 else np.int64)
+    base_draws = np.where(types == INSERTION, rng.integers(0, 4, size=types.shape, dtype=np.uint8),
+                          rng.integers(1, 4, size=types.shape, dtype=np.uint8))
+    lengths = np.full(n_replicates, seq_length, dtype=np.int64)
+    for j in range(n_mutations):
+        step = types[:, j]
+        step[(step == DELETION) & (lengths == 1)] = SUBSTITUTION
+        positions[:, j] = rng.random(n_replicates) * lengths
+        lengths += (step == INSERTION).astype(np.int64) - (step == DELETION)
+    return {"types": types, "positions": positions, "base_draws": base_draws, "lengths": lengths}
+
+
+def mutation_batch_blocks(seq_length, n_replicates, n_mutations, seed=None, max_block=MAX_BLOCK_MUTATIONS):
+    # simulate_mutation_batch() over consecutive blocks of replicates, each with its own random
+    # stream, so memory stays bounded however many replicates are asked for
+    rows = max(1, max_block // n_mutations)
+    n_blocks = -(-n_replicates // rows)
+    for i, block_seed in enumerate(np.random.SeedSequence(seed).spawn(n_blocks)):
+        yield simulate_mutation_batch(seq_length, min(rows, n_replicates - i * rows), n_mutations, seed=block_seed)
+
+
+def apply_mutation_batch(seq, batch, replicate=0):
+    # Replays one replicate's mutations on an actual sequence (for previews of short inputs)
+    codes = list(encode_sequence(seq))
+    for kind, pos, draw in zip(batch["types"][replicate], batch["positions"][replicate], batch["base_draws"][replicate]):
+        if kind == INSERTION:
+            codes.insert(pos, draw)
+        elif kind == DELETION:
+            del codes[pos]
+        else:
+            codes[pos] = (codes[pos] + draw) % 4
+    return decode_sequence(codes)
+
+
+def summarize_mutation_blocks(blocks, seq_length, n_mutations, position_bins=50):
+    # Folds the batches from mutation_batch_blocks() into counts per mutation type, a position
+    # histogram, the distribution and mean of final lengths, and replicate 0's mutations ("first",
+    # for previews). Yields the number of replicates done after each block; returns the summary.
+    type_counts = np.zeros(3, dtype=np.int64)
+    position_counts = np.zeros(seq_length + n_mutations, dtype=np.int64)
+    # Each mutation changes the length by at most one
+    shortest = seq_length - n_mutations
+    length_counts = np.zeros(2 * n_mutations + 1, dtype=np.int64)
+    first = None
+    done = 0
+    for batch in blocks:
+        if first is None:
+            first = {key: batch[key][:1].copy() for key in ("types", "positions", "base_draws")}
+        type_counts += np.bincount(batch["types"].reshape(-1), minlength=3)
+        position_counts += np.bincount(batch["positions"].reshape(-1), minlength=position_counts.size)
+        length_counts += np.bincount(batch["lengths"] - shortest, minlength=length_counts.size)
+        done += batch["lengths"].size
+        yield done
+    used = np.flatnonzero(position_counts)
+    upper = max(seq_length, int(used[-1]) + 1 if used.size else 0)
+    hist, edges = np.histogram(np.arange(upper), bins=position_bins, range=(0, upper), weights=position_counts[:upper])
+    present = np.flatnonzero(length_counts)
+    return {
+        "type_counts": dict(zip(MUTATION_TYPES, type_counts.tolist())),
+        "position_histogram": (edges[:-1], hist.astype(np.int64)),
+        "final_lengths": (present + shortest, length_counts[present]),
+        "mean_length": float((present + shortest) @ length_counts[present] / max(done, 1)),
+        "first": first,
+    }
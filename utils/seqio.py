@@ -0,0 +1,165 @@
+import os
+import mmap
+import tempfile
+import numpy as np
+from utils.dna import BASES, PackedSequence, decode_sequence
+
+CHUNK_SIZE = 1 << 24
+
+# Like the table in utils.dna, but uploaded files may use lower case (soft-masked) bases
+_FILE_ENCODE_TABLE = np.full(256, 255, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _FILE_ENCODE_TABLE[ord(_base)] = _code
+    _FILE_ENCODE_TABLE[ord(_base.lower())] = _code
+_LINE_BREAKS = np.zeros(256, dtype=bool)
+_LINE_BREAKS[[ord("\n"), ord("\r")]] = True
+
+
+class SequenceRecord:
+    # One FASTA/FASTQ record: a name plus the byte range of its sequence lines in the mapped
+    # file. Nothing is decoded until codes(), packed() or sequence() is called.
+    __slots__ = ("name", "_buffer", "_start", "_end", "_length")
+
+    def __init__(self, name, buffer, start, end):
+        self.name = name
+        self._buffer = buffer
+        self._start = start
+        self._end = end
+        self._length = None
+
+    def _chunks(self):
+        for offset in range(self._start, self._end, CHUNK_SIZE):
+            raw = np.frombuffer(self._buffer, dtype=np.uint8, count=min(CHUNK_SIZE, self._end - offset), offset=offset)
+            yield raw[~_LINE_BREAKS[raw]]
+
+    def __len__(self):
+        if self._length is None:
+            self._length = sum(chunk.size for chunk in self._chunks())
+        return self._length
+
+    def validate(self):
+        # Returns (number of bases, number of invalid bases, 0-based position of the first one)
+        n_bases, n_invalid, first_invalid = 0, 0, None
+        for chunk in self._chunks():
+            invalid = _FILE_ENCODE_TABLE[chunk] == 255
+            count = int(np.count_nonzero(invalid))
+            if count and first_invalid is None:
+                first_invalid = n_bases + int(np.argmax(invalid))
+            n_bases += chunk.size
+            n_invalid += count
+        self._length = n_bases
+        return n_bases, n_invalid, first_invalid
+
+    def codes(self):
+        parts = [_FILE_ENCODE_TABLE[chunk] for chunk in self._chunks()]
+        codes = np.concatenate(parts) if parts else np.empty(0, dtype=np.uint8)
+        if codes.size == 0 or (codes == 255).any():
+            raise ValueError(f"Invalid sequence in record '{self.name}'. Only letters A, T, C, G allowed.")
+        return codes
+
+    def packed(self):
+        return PackedSequence.from_codes(self.codes())
+
+    def sequence(self):
+        return decode_sequence(self.codes())
+
+
+class SequenceReader:
+    # Memory-mapped FASTA/FASTQ reader; records are found lazily by scanning the mapping
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        first = self._buffer[:1]
+        if first == b">":
+            self.format = "fasta"
+        elif first == b"@":
+            self.format = "fastq"
+        else:
+            self.close()
+            raise ValueError("Unrecognised file: FASTA files start with '>' and FASTQ files with '@'.")
+
+    def __iter__(self):
+        return self._iter_fasta() if self.format == "fasta" else self._iter_fastq()
+
+    def _line_end(self, pos):
+        end = self._buffer.find(b"\n", pos)
+        return len(self._buffer) if end < 0 else end
+
+    def _name(self, start, end):
+        return bytes(self._buffer[start + 1:end]).decode("utf-8", errors="replace").strip()
+
+    def _iter_fasta(self):
+        pos = 0
+        while 0 <= pos < len(self._buffer):
+            header_end = self._line_end(pos)
+            next_record = self._buffer.find(b"\n>", header_end)
+            end = len(self._buffer) if next_record < 0 else next_record + 1
+            yield SequenceRecord(self._name(pos, header_end), self._buffer, min(header_end + 1, end), end)
+            pos = end if next_record >= 0 else -1
+
+    def _iter_fastq(self):
+        # Four-line records: @name, sequence, +, qualities
+        pos = 0
+        size = len(self._buffer)
+        while pos < size:
+            # Blank lines between records and at the end of the file are skipped
+            if self._buffer[pos:pos + 1] in (b"\n", b"\r"):
+                pos += 1
+                continue
+            if self._buffer[pos:pos + 1] != b"@":
+                raise ValueError(f"Malformed FASTQ record at byte {pos}.")
+            header_end = self._line_end(pos)
+            seq_end = self._line_end(header_end + 1)
+            plus_end = self._line_end(seq_end + 1)
+            qual_end = self._line_end(plus_end + 1)
+            yield SequenceRecord(self._name(pos, header_end), self._buffer, header_end + 1, seq_end)
+            pos = qual_end + 1
+
+    def records(self, limit=None):
+        records = []
+        for record in self:
+            if limit is not None and len(records) >= limit:
+                break
+            records.append(record)
+        return records
+
+    def iter_code_batches(self, batch_size=50000):
+        # Reads grouped by length into (n, length) code arrays for the k-mer counter;
+        # records with invalid bases are skipped
+        pending = {}
+        for record in self:
+            try:
+                codes = record.codes()
+            except ValueError:
+                continue
+            group = pending.setdefault(codes.size, [])
+            group.append(codes)
+            if len(group) >= batch_size:
+                yield np.stack(group)
+                group.clear()
+        for group in pending.values():
+            if group:
+                yield np.stack(group)
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def save_upload(uploaded_file, chunk_size=CHUNK_SIZE):
+    # Copies a Streamlit upload to a temporary file in chunks so it can be memory-mapped
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, prefix="genome_upload_") as out:
+        uploaded_file.seek(0)
+        while chunk := uploaded_file.read(chunk_size):
+            out.write(chunk)
+    return out.name
@@ -0,0 +1,92 @@
+import os
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+NAMES = ["Shreyas", "Arnab", "Aditya", "Arjun", "Krishna", "Rohan", "Ishaan", "Kunal", "Sanya", "Ananya", "Priya", "Kavya",
+         "Ritika", "Nisha", "Meera", "Divya", "Rahul", "Amit", "Sneha", "Pooja", "Varun", "Neha", "Shreya", "Manish", "Akash",
+         "Vikram", "Sunita", "Lakshmi", "Ramesh", "Deepak", "Geeta", "Ajay", "Suresh", "Anjali", "Swati", "Tanvi", "Kabir",
+         "Riya", "Anvi", "Aarav", "Aanya", "Vihaan", "Sara", "Om", "Nitin"]
+
+# Value -> probability for each trait, in the order used for correlations (see generate_traits)
+DEFAULT_FREQUENCIES = {
+    "Eye Colour": {"Brown": 0.5, "Black": 0.5},
+    "Dimples": {"Yes": 0.5, "No": 0.5},
+    "Earlobe": {"Free": 0.5, "Attached": 0.5},
+    "Tongue Roll": {"Yes": 0.5, "No": 0.5},
+    "Handedness": {"Right": 0.89, "Left": 0.10, "Mixed": 0.01},
+}
+DEFAULT_AGE_RANGE = (18, 25)
+CHUNK_ROWS = 1_000_000
+
+
+def _thresholds(probabilities):
+    # Cut points on a standard normal that split it into the given probabilities
+    cumulative = np.cumsum(probabilities)[:-1] / np.sum(probabilities)
+    return np.array([NormalDist().inv_cdf(min(max(p, 1e-12), 1 - 1e-12)) for p in cumulative])
+
+
+def _latent_factor(columns, correlations):
+    matrix = np.eye(len(columns))
+    for (a, b), rho in (correlations or {}).items():
+        i, j = columns.index(a), columns.index(b)
+        matrix[i, j] = matrix[j, i] = rho
+    try:
+        return np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        raise ValueError("The trait correlations are not a valid correlation matrix.") from None
+
+
+def generate_traits(n_rows, seed=None, frequencies=None, correlations=None, age_range=DEFAULT_AGE_RANGE,
+                    names=NAMES, chunk_rows=CHUNK_ROWS):
+    # Yields DataFrames of at most chunk_rows rows with the dashboard's schema. Each trait and
+    # Age is cut from a latent standard normal; correlations ({(column, column): rho}) are
+    # applied to the latent variables (a Gaussian copula), so "Dimples"/"Tongue Roll" at 0.5
+    # makes the first listed values of both traits tend to occur together.
+    # The rows produced for a seed do not depend on chunk_rows.
+    frequencies = {**DEFAULT_FREQUENCIES, **(frequencies or {})}
+    columns = list(frequencies) + ["Age"]
+    factor = _latent_factor(columns, correlations)
+    cuts = [_thresholds(list(frequencies[trait].values())) for trait in frequencies]
+    low, high = age_range
+    cuts.append(_thresholds(np.ones(high - low + 1)))
+    latent_rng, name_rng = (np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(2))
+
+    start = 0
+    while start < n_rows:
+        size = min(chunk_rows, n_rows - start)
+        latent = latent_rng.standard_normal((size, len(columns))) @ factor.T
+        chunk = {
+            "S.No": np.arange(start + 1, start + size + 1, dtype=np.int32 if n_rows < 2**31 else np.int64),
+            "Name": pd.Categorical.from_codes(name_rng.integers(0, len(names), size), categories=names),
+            "Age": (low + np.searchsorted(cuts[-1], latent[:, -1])).astype(np.int16 if high > 127 else np.int8),
+        }
+        for i, trait in enumerate(frequencies):
+            values = list(frequencies[trait])
+            chunk[trait] = pd.Categorical.from_codes(np.searchsorted(cuts[i], latent[:, i]), categories=values)
+        yield pd.DataFrame(chunk, columns=["S.No", "Name", "Age"] + list(frequencies))
+        start += size
+
+
+def write_traits(path, n_rows, **kwargs):
+    # Streams generate_traits() to a .parquet or .csv file one chunk at a time
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in (".parquet", ".csv"):
+        raise ValueError("Write to a .parquet or .csv file.")
+    if ext == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    writer = None
+    try:
+        for i, chunk in enumerate(generate_traits(n_rows, **kwargs)):
+            if ext == ".csv":
+                chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+                continue
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
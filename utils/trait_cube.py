@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+MAX_CUBE_CELLS = 1 << 24
+
+
+class TraitCube:
+    # Dense count cube over low-cardinality columns: one cell per combination of values,
+    # counted in a single pass. Cross-tabs, slices and roll-ups are then sums over the cube
+    # and never touch the rows.
+    def __init__(self, dims, labels, counts):
+        self.dims = list(dims)
+        self.labels = labels
+        self.counts = counts
+
+    @classmethod
+    def build(cls, df, dims):
+        codes, labels = [], {}
+        for dim in dims:
+            column = df[dim]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                dim_codes, values = column.cat.codes.to_numpy().astype(np.int64), column.cat.categories
+            else:
+                dim_codes, values = pd.factorize(column, sort=True)
+            codes.append(dim_codes)
+            labels[dim] = list(values)
+        shape = tuple(max(len(labels[dim]), 1) for dim in dims)
+        if np.prod(shape, dtype=float) > MAX_CUBE_CELLS:
+            raise ValueError(f"Too many value combinations for a cube over {', '.join(dims)}.")
+        complete = np.logical_and.reduce([c >= 0 for c in codes])
+        flat = np.ravel_multi_index([c[complete] for c in codes], shape)
+        counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+        return cls(dims, labels, counts)
+
+    @property
+    def n_rows(self):
+        return int(self.counts.sum())
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes
+
+    def crosstab(self, rows, columns=None, filters=None, bands=None, normalize=None):
+        # rows/columns: dimensions to group by (columns is a single dimension or None).
+        # filters: {dim: allowed values} to slice the cube first.
+        # bands: {dim: width} to roll a numeric dimension up into bands of that width.
+        # normalize: None for counts, "index" for row shares, "columns" or "all".
+        counts, labels = self.counts, dict(self.labels)
+        for dim, allowed in (filters or {}).items():
+            axis = self.dims.index(dim)
+            keep = [i for i, value in enumerate(labels[dim]) if value in set(allowed)]
+            counts = counts.take(keep, axis=axis)
+            labels[dim] = [labels[dim][i] for i in keep]
+        for dim, width in (bands or {}).items():
+            axis = self.dims.index(dim)
+            values = np.asarray(labels[dim])
+            if values.size == 0:
+                continue
+            band = (values // width) * width
+            starts = np.flatnonzero(np.r_[True, band[1:] != band[:-1]])
+            counts = np.add.reduceat(counts, starts, axis=axis)
+            labels[dim] = [f"{int(b)}–{int(b) + width - 1}" for b in band[starts]]
+
+        keep_dims = list(rows) + ([columns] if columns else [])
+        summed = counts.sum(axis=tuple(i for i, dim in enumerate(self.dims) if dim not in keep_dims))
+        remaining = [dim for dim in self.dims if dim in keep_dims]
+        summed = np.transpose(summed, [remaining.index(dim) for dim in keep_dims])
+        n_rows = int(np.prod([len(labels[dim]) for dim in rows]))
+        table = summed.reshape(n_rows, -1)
+        index = pd.MultiIndex.from_product([labels[dim] for dim in rows], names=rows) if rows else pd.Index(["All"])
+        if len(rows) == 1:
+            index = index.get_level_values(0)
+        result = pd.DataFrame(table, index=index,
+                              columns=pd.Index(labels[columns], name=columns) if columns else ["Count"])
+        if normalize == "index":
+            result = result.div(result.sum(axis=1).replace(0, np.nan), axis=0)
+        elif normalize == "columns":
+            result = result.div(result.sum(axis=0).replace(0, np.nan), axis=1)
+        elif normalize == "all":
+            result = result / max(result.to_numpy().sum(), 1)
+        return result
@@ -0,0 +1,384 @@
+import io
+import re
+import hashlib
+import warnings
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.dataset_cache import cached_load, content_hash
+from utils.synthetic import NAMES, generate_traits
+from utils.trait_cube import TraitCube
+from utils.trait_index import TraitIndex
+
+REQUIRED_COLS = {"Name", "Age", "Eye Colour", "Dimples", "Earlobe", "Tongue Roll", "Handedness"}
+TRAIT_COLS = ["Eye Colour", "Dimples", "Earlobe", "Tongue Roll", "Handedness"]
+CHUNK_SIZE = 250_000
+MAX_BAD_ROW_SAMPLES = 1000
+# The profile picker lists at most this many names; a search narrows it down
+MAX_NAME_OPTIONS = 1000
+DEMO_SEED = 42
+# Larger datasets can be written to disk with benchmarks/generate_traits.py and uploaded
+MAX_SYNTHETIC_ROWS = 10_000_000
+# Bump when load_trait_csv changes what it returns, so stale cached frames are not reused
+CACHE_VERSION = 1
+
+_SKIPPED_LINE = re.compile(r"Skipping line (\d+): (.*)")
+
+
+def check_columns(columns):
+    missing = REQUIRED_COLS.difference(columns)
+    if missing:
+        raise ValueError(f"Error: The uploaded CSV must contain these columns: {', '.join(sorted(REQUIRED_COLS))} "
+                         f"(missing: {', '.join(sorted(missing))})")
+
+
+def _file_line(row, skipped_lines):
+    # Parsed row index -> 1-based line in the file, counting the header and skipped lines
+    line = row + 2
+    for skipped in skipped_lines:
+        if skipped > line:
+            break
+        line += 1
+    return line
+
+
+def _add_bad_row(bad_rows, line, reason):
+    if len(bad_rows) < MAX_BAD_ROW_SAMPLES:
+        bad_rows.append({"line": line, "reason": reason})
+
+
+def concat_trait_frames(frames):
+    # Frames can have different category sets; align them so concat keeps the categorical dtype
+    for col in TRAIT_COLS:
+        categories = sorted(set().union(*(frame[col].cat.categories for frame in frames)))
+        for frame in frames:
+            frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_trait_csv(source, chunksize=CHUNK_SIZE):
+    # Reads the header first so a file with missing columns fails before any rows are parsed,
+    # then streams the rows in chunks with categorical trait columns and a small-int Age.
+    # Rows that cannot be parsed or that lack required values are skipped and reported.
+    # Returns (frame, report).
+    if hasattr(source, "seek"):
+        source.seek(0)
+    header = pd.read_csv(source, nrows=0).columns
+    check_columns(header)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    dtypes = {col: "category" for col in TRAIT_COLS}
+    dtypes.update({"Name": str, "Age": str})
+
+    chunks = []
+    bad_rows = []
+    skipped_lines = []
+    n_invalid = 0
+    parsed = 0
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", pd.errors.ParserWarning)
+        # index_col=False: a trailing comma on every row (common in Excel exports) must not turn
+        # the first column into the index and shift the others
+        for chunk in pd.read_csv(source, dtype=dtypes, chunksize=chunksize, on_bad_lines="warn", index_col=False):
+            # Malformed lines are dropped by the parser and only reported through warnings
+            while len(caught):
+                for line, reason in _SKIPPED_LINE.findall(str(caught.pop(0).message)):
+                    skipped_lines.append(int(line))
+                    _add_bad_row(bad_rows, int(line), reason.strip())
+            age = pd.to_numeric(chunk["Age"], errors="coerce")
+            bad_age = age.isna() | (age % 1 != 0) | (age < 0) | (age > 150)
+            invalid = bad_age | chunk[list(REQUIRED_COLS - {"Age"})].isna().any(axis=1)
+            if invalid.any():
+                # Line numbers come from each row's position in the parsed rows, not its index label
+                invalid_bad_age = bad_age.to_numpy()
+                for pos in np.flatnonzero(invalid.to_numpy())[:max(0, MAX_BAD_ROW_SAMPLES - len(bad_rows))]:
+                    _add_bad_row(bad_rows, _file_line(parsed + int(pos), skipped_lines),
+                                 "invalid Age" if invalid_bad_age[pos] else "missing value")
+                n_invalid += int(invalid.sum())
+                chunk = chunk[~invalid]
+                age = age[~invalid]
+            parsed += len(invalid)
+            chunk["Age"] = age.astype("int16")
+            chunks.append(chunk)
+    n_bad = len(skipped_lines) + n_invalid
+
+    if chunks:
+        df = concat_trait_frames(chunks)
+    else:
+        df = pd.DataFrame({col: pd.Series(dtype=dtypes.get(col, "object")) for col in header})
+    df["Age"] = pd.to_numeric(df["Age"].astype("int16"), downcast="integer")
+    if "S.No" in df.columns:
+        df["S.No"] = pd.to_numeric(df["S.No"], errors="coerce", downcast="integer")
+    else:
+        df.insert(0, "S.No", pd.RangeIndex(1, 1 + len(df)).astype("int32"))
+    report = {"rows": len(df), "bad_rows": n_bad, "bad_row_samples": pd.DataFrame(sorted(bad_rows, key=lambda r: r["line"]), columns=["line", "reason"])}
+    return df, report
+
+
+def load_trait_upload(source):
+    # load_trait_csv through the on-disk dataset cache
+    return cached_load(source, load_trait_csv, namespace=f"traits-v{CACHE_VERSION}-")
+
+
+def generate_demo_data(seed=DEMO_SEED):
+    # One row per demo name, drawn from the synthetic generator so it is the same every time
+    df = next(generate_traits(len(NAMES), seed=seed))
+    df["Name"] = pd.Series(NAMES, dtype=str)
+    return df
+
+
+# --- Session dataset ---
+# The dataset is loaded once per session and kept in st.session_state, so every page works on
+# the same DataFrame object. Pages must treat it as read-only and copy before changing it.
+
+def _on_upload():
+    uploaded = st.session_state.get("trait_upload")
+    if uploaded is None:
+        # The user removed the file; fall back to the demo data
+        st.session_state.pop("trait_dataset", None)
+        return
+    try:
+        df, report = load_trait_upload(uploaded)
+    except ValueError as e:
+        st.session_state["trait_upload_error"] = str(e)
+        return
+    st.session_state["trait_dataset"] = {"name": uploaded.name, "df": df, "report": report, "hash": content_hash(uploaded)}
+
+
+def _on_append():
+    uploaded = st.session_state.get("trait_append")
+    dataset = st.session_state.get("trait_dataset")
+    if uploaded is None or dataset is None:
+        return
+    try:
+        rows, report = load_trait_upload(uploaded)
+    except ValueError as e:
+        st.session_state["trait_upload_error"] = str(e)
+        return
+    previous_hash = get_dataset_hash(dataset)
+    append_trait_rows(dataset, rows)
+    dataset["hash"] = hashlib.blake2b(f"{previous_hash}+{content_hash(uploaded)}".encode(), digest_size=16).hexdigest()
+    dataset["name"] = f"{dataset['name']} + {uploaded.name}"
+    dataset["report"] = {"rows": len(dataset["df"]), "bad_rows": dataset["report"]["bad_rows"] + report["bad_rows"],
+                         "bad_row_samples": pd.concat([dataset["report"]["bad_row_samples"], report["bad_row_samples"]], ignore_index=True)}
+
+
+def append_trait_rows(dataset, rows):
+    # Adds rows to the session dataset. The frame is replaced rather than changed in place,
+    # and the aggregate index is updated with the new rows only.
+    df = dataset["df"]
+    index = get_trait_index(dataset)
+    # The required columns are checked on load; optional columns the new file lacks are left
+    # empty, and columns the dataset does not have are dropped
+    rows = rows.reindex(columns=df.columns)
+    rows["S.No"] = np.arange(len(df) + 1, len(df) + 1 + len(rows), dtype=np.int32)
+    # Shallow copy: aligning categories must not change the frame the pages already hold
+    dataset["df"] = concat_trait_frames([df.copy(deep=False), rows])
+    index.append(rows)
+    dataset.pop("hash", None)
+    dataset.pop("cube", None)
+
+
+def generate_synthetic_dataset(n_rows, seed):
+    df = pd.concat(generate_traits(n_rows, seed=seed), ignore_index=True)
+    report = {"rows": n_rows, "bad_rows": 0, "bad_row_samples": pd.DataFrame(columns=["line", "reason"])}
+    return {"name": f"synthetic (seed {seed})", "df": df, "report": report, "hash": f"synthetic-v{CACHE_VERSION}-{n_rows}-{seed}"}
+
+
+def get_trait_index(dataset):
+    # Built on first use and kept with the dataset
+    if "index" not in dataset:
+        dataset["index"] = TraitIndex.build(dataset["df"], TRAIT_COLS)
+    return dataset["index"]
+
+
+def get_trait_cube(dataset):
+    # Count cube over the trait columns and Age, built on first use and kept with the dataset
+    if "cube" not in dataset:
+        dataset["cube"] = TraitCube.build(dataset["df"], TRAIT_COLS + ["Age"])
+    return dataset["cube"]
+
+
+def get_dataset_hash(dataset):
+    # Identifies the dataset's contents, for caches shared between sessions. Uploads use the
+    # hash of the file; other datasets hash the frame itself on first use.
+    if "hash" not in dataset:
+        row_hashes = pd.util.hash_pandas_object(dataset["df"], index=False).to_numpy()
+        dataset["hash"] = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+    return dataset["hash"]
+
+
+def get_trait_dataset():
+    # Returns the session's dataset: {"name": file name or None for demo data, "df", "report"}
+    dataset = st.session_state.get("trait_dataset")
+    if dataset is None:
+        if "trait_demo_data" not in st.session_state:
+            st.session_state["trait_demo_data"] = {"name": None, "df": generate_demo_data(), "report": None}
+        dataset = st.session_state["trait_demo_data"]
+    return dataset
+
+
+def trait_data_sidebar():
+    # The shared upload widget. A file uploaded on one page stays loaded on the others until it
+    # is removed or replaced.
+    st.sidebar.file_uploader("📂 Upload your own CSV data", type="csv", key="trait_upload", on_change=_on_upload)
+    error = st.session_state.pop("trait_upload_error", None)
+    if error:
+        st.error(error)
+        st.stop()
+    with st.sidebar.expander("🧪 Generate synthetic data"):
+        with st.form("synthetic_data_form", border=False):
+            n_rows = st.number_input("Rows:", 1_000, MAX_SYNTHETIC_ROWS, 100_000, step=100_000)
+            seed = st.number_input("Seed:", 0, 2**32 - 1, 0)
+            if st.form_submit_button("Generate", use_container_width=True):
+                st.session_state["trait_dataset"] = generate_synthetic_dataset(int(n_rows), int(seed))
+    dataset = get_trait_dataset()
+    if dataset["name"] is None:
+        st.sidebar.info("Using demo data. Upload a CSV to analyze your own!")
+    else:
+        st.sidebar.success(f"Custom data loaded: {dataset['name']} ({len(dataset['df']):,} rows)")
+        report = dataset["report"]
+        if report["bad_rows"]:
+            st.sidebar.warning(f"Skipped {report['bad_rows']:,} bad rows.")
+            with st.sidebar.expander("Show skipped rows"):
+                st.dataframe(report["bad_row_samples"], hide_index=True)
+        st.sidebar.file_uploader("➕ Append rows from another CSV", type="csv", key="trait_append", on_change=_on_append)
+    return dataset["df"]
+
+
+# --- Memory report ---
+
+def object_nbytes(value, _seen=None):
+    # Approximate bytes held by a session value; shared objects are only counted once
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(getattr(value, "nbytes", None), int):
+        # NumPy arrays and the index/cube/sequence types that report their own size
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(object_nbytes(v, _seen) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(object_nbytes(v, _seen) for v in value)
+    if isinstance(value, io.BytesIO):
+        # Uploaded files stay in memory while the uploader holds them
+        return value.getbuffer().nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return 0
+
+
+def session_memory_report():
+    # Bytes held by each session-state entry, largest first
+    seen = set()
+    # Datasets first, so a frame that other entries also refer to is counted under its dataset
+    keys = sorted(st.session_state.keys(), key=lambda key: not str(key).startswith("trait_"))
+    rows = [{"key": key, "bytes": object_nbytes(st.session_state[key], seen)} for key in keys]
+    return pd.DataFrame(rows, columns=["key", "bytes"]).sort_values("bytes", ascending=False, ignore_index=True)
+
+
+def dataset_memory_report(df):
+    usage = df.memory_usage(index=False, deep=True)
+    return pd.DataFrame({"column": usage.index, "dtype": df.dtypes.astype(str).values, "bytes": usage.values})
+
+
+def format_bytes(n):
+    for unit in ["B", "KB", "MB"]:
+        if n < 1024:
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} GB"
+
+
+def memory_sidebar():
+    report = session_memory_report()
+    with st.sidebar.expander(f"💾 Session memory: {format_bytes(report['bytes'].sum())}"):
+        st.dataframe(report, hide_index=True)
+        st.caption("Current dataset by column")
+        st.dataframe(dataset_memory_report(get_trait_dataset()["df"]), hide_index=True)
+
+
+# --- Dataset explorer ---
+# The explorer filters and sorts with whole-column NumPy operations and only builds (and
+# styles) the rows of the visible page.
+
+def filter_mask(df, filters, index=None):
+    # filters: {column: list of allowed values, "Age": (min, max), "Name": substring}.
+    # With an index, trait filters are combined on its packed bitmaps.
+    if index is not None:
+        indexed = {col: allowed for col, allowed in filters.items() if col in index.traits}
+        filters = {col: allowed for col, allowed in filters.items() if col not in indexed}
+        mask = index.mask(indexed)
+    else:
+        mask = np.ones(len(df), dtype=bool)
+    for col, allowed in filters.items():
+        if col == "Age":
+            age = df["Age"].to_numpy()
+            mask &= (age >= allowed[0]) & (age <= allowed[1])
+        elif col == "Name":
+            if allowed:
+                mask &= df["Name"].str.contains(allowed, case=False, regex=False).to_numpy(dtype=bool, na_value=False)
+        elif isinstance(df[col].dtype, pd.CategoricalDtype):
+            # Compare the small integer codes instead of the strings
+            wanted = df[col].cat.categories.get_indexer(list(allowed))
+            mask &= np.isin(df[col].cat.codes.to_numpy(), wanted[wanted >= 0])
+        else:
+            mask &= df[col].isin(allowed).to_numpy()
+    return mask
+
+
+def find_names(df, query="", limit=MAX_NAME_OPTIONS, chunk_rows=CHUNK_SIZE):
+    # {name: first row position} for up to limit distinct names containing query. The column is
+    # scanned a chunk at a time and the scan stops as soon as enough names are found.
+    found = {}
+    for start in range(0, len(df), chunk_rows):
+        chunk = df["Name"].iloc[start:start + chunk_rows]
+        positions = np.arange(start, start + len(chunk))
+        if query:
+            hits = chunk.str.contains(query, case=False, regex=False).to_numpy(dtype=bool, na_value=False)
+            chunk, positions = chunk[hits], positions[hits]
+        for name, position in zip(chunk.to_numpy(), positions.tolist()):
+            if isinstance(name, str) and name not in found:
+                found[name] = position
+                if len(found) >= limit:
+                    return found
+    return found
+
+
+def value_mask(df, col, value):
+    if isinstance(df[col].dtype, pd.CategoricalDtype):
+        code = df[col].cat.categories.get_indexer([value])[0]
+        return df[col].cat.codes.to_numpy() == code if code >= 0 else np.zeros(len(df), dtype=bool)
+    return (df[col] == value).to_numpy()
+
+
+def sort_order(df, col, ascending, cache=None):
+    # Row positions of df sorted by col. Sorting a few million strings takes seconds, so the
+    # order is kept in cache (a dict) for later pages and reruns.
+    key = (col, ascending)
+    if cache is not None and key in cache:
+        return cache[key]
+    codes, _ = pd.factorize(df[col], sort=True)
+    order = np.argsort(codes if ascending else -codes, kind="stable").astype(np.int32)
+    if cache is not None:
+        cache[key] = order
+    return order
+
+
+def explorer_rows(df, filters, sort_by=None, ascending=True, sort_cache=None, index=None):
+    # Positions of the rows matching filters, in display order
+    mask = filter_mask(df, filters, index)
+    if sort_by is None:
+        return np.flatnonzero(mask)
+    order = sort_order(df, sort_by, ascending, sort_cache)
+    return order[mask[order]]
+
+
+def style_highlight(page_df, highlight, css="background-color: #2575FC; color: white"):
+    styles = np.where(highlight[:, None], css, "")
+    return page_df.style.apply(lambda _: np.broadcast_to(styles, page_df.shape), axis=None)
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+MAX_AGE = 150
+
+
+def _append_bits(packed, n_old, mask):
+    # Appends a boolean mask to a bitmap holding n_old bits
+    if n_old % 8 == 0:
+        return np.concatenate([packed, np.packbits(mask)])
+    tail = np.unpackbits(packed[-1:], count=n_old % 8)
+    return np.concatenate([packed[:-1], np.packbits(np.concatenate([tail, mask]))])
+
+
+class TraitIndex:
+    # Aggregates for the dashboard, built once per dataset: row counts per trait value, a
+    # packed row bitmap per trait value and an age histogram. append() folds in new rows
+    # without rescanning the rows already indexed.
+    def __init__(self, traits):
+        self.traits = list(traits)
+        self.n_rows = 0
+        self.counts = {trait: {} for trait in self.traits}
+        self.bitmaps = {trait: {} for trait in self.traits}
+        self.age_counts = np.zeros(MAX_AGE + 1, dtype=np.int64)
+
+    @classmethod
+    def build(cls, df, traits):
+        index = cls(traits)
+        index.append(df)
+        return index
+
+    def append(self, rows):
+        n_old, n_new = self.n_rows, len(rows)
+        for trait in self.traits:
+            column = rows[trait]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                codes, values = column.cat.codes.to_numpy(), column.cat.categories
+            else:
+                codes, values = pd.factorize(column)
+            present = np.bincount(codes[codes >= 0], minlength=len(values))
+            counts, bitmaps = self.counts[trait], self.bitmaps[trait]
+            for code, value in enumerate(values):
+                if value not in bitmaps:
+                    # A value first seen in this batch: its bitmap is all zeros so far
+                    counts[value] = 0
+                    bitmaps[value] = np.zeros(-(-n_old // 8), dtype=np.uint8)
+                counts[value] += int(present[code])
+                bitmaps[value] = _append_bits(bitmaps[value], n_old, codes == code)
+            for value in bitmaps.keys() - set(values):
+                bitmaps[value] = _append_bits(bitmaps[value], n_old, np.zeros(n_new, dtype=bool))
+        ages = rows["Age"].to_numpy()
+        self.age_counts += np.bincount(ages[(ages >= 0) & (ages <= MAX_AGE)], minlength=MAX_AGE + 1)
+        self.n_rows += n_new
+
+    def value_counts(self, trait):
+        # Like Series.value_counts(): present values only, most common first
+        counts = pd.Series(self.counts[trait], dtype=np.int64)
+        return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+    def values(self, trait):
+        return [value for value, count in self.counts[trait].items() if count > 0]
+
+    def fraction(self, trait, value):
+        return self.counts[trait].get(value, 0) / self.n_rows if self.n_rows else 0.0
+
+    def bitmap(self, trait, values):
+        # Packed bitmap of the rows whose trait is any of values
+        packed = np.zeros(-(-self.n_rows // 8), dtype=np.uint8)
+        for value in values:
+            if value in self.bitmaps[trait]:
+                packed |= self.bitmaps[trait][value]
+        return packed
+
+    def mask(self, filters):
+        # Boolean row mask for {trait: allowed values}, combined on the packed bitmaps
+        packed = np.full(-(-self.n_rows // 8), 0xFF, dtype=np.uint8)
+        for trait, values in filters.items():
+            packed &= self.bitmap(trait, values)
+        return np.unpackbits(packed, count=self.n_rows).view(bool)
+
+    def age_histogram(self):
+        # (age, count) for every age present
+        ages = np.flatnonzero(self.age_counts)
+        return pd.DataFrame({"Age": ages, "Count": self.age_counts[ages]})
+
+    def age_stats(self):
+        ages = np.flatnonzero(self.age_counts)
+        if ages.size == 0:
+            return 0, 0, 0.0
+        mean = float((ages * self.age_counts[ages]).sum() / self.age_counts.sum())
+        return int(ages[0]), int(ages[-1]), mean
+
+    @property
+    def nbytes(self):
+        return sum(b.nbytes for bitmaps in self.bitmaps.values() for b in bitmaps.values()) + self.age_counts.nbytes
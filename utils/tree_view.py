@@ -0,0 +1,114 @@
+import html
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Trees with more nodes than this are summarized as tables; the diagram always shows at most
+# MAX_LEVELS levels below the chosen node
+MAX_RENDER_NODES = 255
+MAX_LEVELS = 6
+CLASS_COLOURS = ["#e58139", "#39e581", "#8139e5", "#e5d439", "#39c4e5", "#e539a6"]
+
+
+def parents(tree):
+    parent = np.full(tree.node_count, -1)
+    for children in (tree.children_left, tree.children_right):
+        has = children >= 0
+        parent[children[has]] = np.flatnonzero(has)
+    return parent
+
+
+def split_labels(tree, node, feature_names, encoders):
+    # Text of the left and right branch of a split node. Label-encoded features are shown as
+    # the values that go each way instead of a threshold on their codes.
+    name = feature_names[tree.feature[node]]
+    threshold = tree.threshold[node]
+    if name in encoders:
+        classes = encoders[name].classes_
+        left = [str(v) for i, v in enumerate(classes) if i <= threshold]
+        right = [str(v) for i, v in enumerate(classes) if i > threshold]
+        return f"{name} ∈ {{{', '.join(left)}}}", f"{name} ∈ {{{', '.join(right)}}}"
+    return f"{name} ≤ {threshold:g}", f"{name} > {threshold:g}"
+
+
+def node_path(tree, node, feature_names, encoders, parent=None):
+    # The conditions on the way from the root to node
+    parent = parents(tree) if parent is None else parent
+    conditions = []
+    while parent[node] >= 0:
+        up = parent[node]
+        left, right = split_labels(tree, up, feature_names, encoders)
+        conditions.append(left if tree.children_left[up] == node else right)
+        node = up
+    return " and ".join(reversed(conditions)) or "all rows"
+
+
+def _node_label(tree, node, class_names):
+    counts = tree.value[node][0]
+    shares = counts / max(counts.sum(), 1e-12)
+    top = int(shares.argmax())
+    return top, (f"{html.escape(str(class_names[top]))} ({shares[top]:.0%})<br/>"
+                 f"{int(tree.n_node_samples[node]):,} samples · node {node}")
+
+
+def tree_dot(model, feature_names, encoders, class_names, root=0, levels=3):
+    # DOT source for the subtree under root, cut off levels below it. Returns the DOT text and
+    # the ids of the cut-off nodes, which can be expanded next.
+    tree = model.tree_
+    lines = ['digraph Tree {', 'node [shape=box, style="filled, rounded", fontname="helvetica", fontsize=11];',
+             'edge [fontname="helvetica", fontsize=10];']
+    frontier = []
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        left, right = tree.children_left[node], tree.children_right[node]
+        top, label = _node_label(tree, node, class_names)
+        if left >= 0 and depth >= levels:
+            frontier.append(int(node))
+            size = int(tree.n_node_samples[node])
+            lines.append(f'{node} [label=<{label}<br/><i>▸ subtree</i>>, style="filled, rounded, dashed", '
+                         f'fillcolor="{CLASS_COLOURS[top % len(CLASS_COLOURS)]}40", tooltip="{size:,} samples"];')
+            continue
+        lines.append(f'{node} [label=<{label}>, fillcolor="{CLASS_COLOURS[top % len(CLASS_COLOURS)]}80"];')
+        if left >= 0:
+            left_label, right_label = split_labels(tree, node, feature_names, encoders)
+            lines.append(f'{node} -> {left} [label="{html.escape(left_label)}"];')
+            lines.append(f'{node} -> {right} [label="{html.escape(right_label)}"];')
+            stack += [(right, depth + 1), (left, depth + 1)]
+    lines.append("}")
+    return "\n".join(lines), sorted(frontier)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_tree(model_key, _model, feature_names, _encoders, class_names, root=0, levels=3):
+    # (format, text, frontier) for one view of a model, cached per model key. The SVG is laid out
+    # on the server when the Graphviz binaries are installed; otherwise the DOT source is
+    # returned for the browser to lay out.
+    import graphviz
+    dot, frontier = tree_dot(_model, feature_names, _encoders, class_names, root, levels)
+    try:
+        return "svg", graphviz.Source(dot).pipe(format="svg", encoding="utf-8"), frontier
+    except (graphviz.ExecutableNotFound, graphviz.CalledProcessError):
+        return "dot", dot, frontier
+
+
+def feature_importance_table(model, feature_names):
+    return (pd.DataFrame({"feature": feature_names, "importance": model.feature_importances_})
+            .sort_values("importance", ascending=False, ignore_index=True))
+
+
+def leaf_path_table(model, feature_names, encoders, class_names, top=20):
+    # The leaves that hold the most training rows, with the path that leads to each
+    tree = model.tree_
+    parent = parents(tree)
+    leaves = np.flatnonzero(tree.children_left < 0)
+    samples = tree.n_node_samples[leaves]
+    order = leaves[np.argsort(-samples, kind="stable")][:top]
+    rows = []
+    for leaf in order:
+        predicted, _ = _node_label(tree, leaf, class_names)
+        rows.append({"path": node_path(tree, leaf, feature_names, encoders, parent),
+                     "samples": int(tree.n_node_samples[leaf]),
+                     "share": tree.n_node_samples[leaf] / tree.n_node_samples[0],
+                     "predicted": class_names[predicted]})
+    return pd.DataFrame(rows)